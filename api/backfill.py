@@ -0,0 +1,262 @@
+"""
+api/backfill.py
+Builds a local, columnar archive of player game logs from API-Basketball.
+
+Walks a date range, fetches every finished game's `games/statistics` and
+writes the normalized player rows to a Parquet dataset partitioned by date:
+
+    <archive>/game_date=YYYY-MM-DD/part-0.parquet
+    <archive>/_checkpoint.json
+
+Progress is checkpointed after every date, so an interrupted run (or one
+that hit the daily quota) picks up where it left off. Requests go through
+helpers, so they share its rate-limit throttle and response cache.
+
+The load_* functions read one player's or one team's history back with
+predicate pushdown instead of loading the whole archive.
+
+Needs pyarrow, which isn't part of the serverless requirements:
+    pip install pyarrow
+    python api/backfill.py --start 2025-10-21 --end 2026-04-12
+
+--player-logs also copies the archived dates into the Firestore player
+logs (see sync_player_logs), so the prop snapshots get the season's
+history before get_data has ingested it game by game.
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+# Allow running `python api/backfill.py` from the root folder
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+import helpers
+import records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_PATH = os.environ.get("GAME_LOG_ARCHIVE", os.path.join("data", "game_logs"))
+CHECKPOINT_FILE = "_checkpoint.json"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.dataset  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError("The game-log archive needs pyarrow: pip install pyarrow") from e
+
+
+def _date_range(start, end):
+    day = datetime.strptime(start, "%Y-%m-%d")
+    last = datetime.strptime(end, "%Y-%m-%d")
+    while day <= last:
+        yield day.strftime("%Y-%m-%d")
+        day += timedelta(days=1)
+
+
+# --- Checkpoint ---
+
+def load_checkpoint(archive=DEFAULT_ARCHIVE_PATH):
+    path = os.path.join(archive, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {"done": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint, archive=DEFAULT_ARCHIVE_PATH):
+    os.makedirs(archive, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=archive, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, os.path.join(archive, CHECKPOINT_FILE))
+
+
+# --- Writing ---
+
+def write_partition(lines, date_str, archive=DEFAULT_ARCHIVE_PATH):
+    """
+    Writes one date's (game_id, [PlayerStatLine]) pairs as a single Parquet
+    file, sorted by player_id so row-group statistics let readers skip
+    data for other players. Re-writing a date replaces its file.
+    """
+    _require_pyarrow()
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frames = [records.to_frame(game_lines, game_id=game_id) for game_id, game_lines in lines]
+    df = pd.concat(frames, ignore_index=True)
+    df = df[df["player_id"] != 0].sort_values("player_id", kind="stable")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    directory = os.path.join(archive, f"game_date={date_str}")
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, "part-0.parquet.tmp")
+    pq.write_table(table, tmp_path, row_group_size=256)
+    os.replace(tmp_path, os.path.join(directory, "part-0.parquet"))
+    return len(df)
+
+
+def backfill_date(date_str, archive=DEFAULT_ARCHIVE_PATH):
+    """
+    Fetches and archives one date. Returns the number of rows written,
+    or None if the scoreboard request failed, a game isn't over yet
+    (still live, or the API's status lags), or a finished game came back
+    without stats (so the date is retried on the next run instead of
+    being checkpointed as done).
+    """
+    games = helpers.get_games_for_date(date_str, season=helpers.season_for_date(date_str))
+    if games is None:
+        logger.warning(f"Couldn't fetch the scoreboard for {date_str}; will retry later.")
+        return None
+
+    over = helpers.FINISHED_GAME_STATUSES | helpers.NOT_PLAYED_GAME_STATUSES
+    pending = [game["game_id"] for game in games if game.get("status") not in over]
+    if pending:
+        logger.warning(f"Games {pending} on {date_str} aren't final yet; will retry later.")
+        return None
+    finished = [game for game in games if game.get("status") in helpers.FINISHED_GAME_STATUSES]
+
+    lines = []
+    for game in finished:
+        game_lines = helpers.get_player_stat_lines(game["game_id"], finished=True)
+        if not game_lines:
+            logger.warning(f"No stats for finished game {game['game_id']} on {date_str}; will retry later.")
+            return None
+        lines.append((game["game_id"], game_lines))
+
+    if not lines:
+        return 0
+    return write_partition(lines, date_str, archive)
+
+
+def backfill(start, end, archive=DEFAULT_ARCHIVE_PATH):
+    """
+    Archives every date from start to end (inclusive), skipping dates
+    already in the checkpoint. Stops early if the daily quota runs out.
+    """
+    _require_pyarrow()
+    checkpoint = load_checkpoint(archive)
+    done = set(checkpoint.get("done", []))
+
+    for date_str in _date_range(start, end):
+        if date_str in done:
+            continue
+        # Only finished days go into the archive; today is still being played
+        if date_str >= datetime.now().strftime("%Y-%m-%d"):
+            logger.info(f"Stopping at {date_str}: games may not be final yet.")
+            break
+        if helpers.get_api_stats()["quota_remaining"] == 0:
+            logger.warning("Daily API quota is used up. Re-run tomorrow to resume.")
+            break
+
+        written = backfill_date(date_str, archive)
+        if written is None:
+            continue
+
+        done.add(date_str)
+        checkpoint["done"] = sorted(done)
+        save_checkpoint(checkpoint, archive)
+        logger.info(f"Archived {written} player rows for {date_str}.")
+
+    logger.info(f"Backfill finished. API usage: {helpers.get_api_stats()}")
+    return checkpoint
+
+
+def sync_player_logs(db, start, end, archive=DEFAULT_ARCHIVE_PATH):
+    """
+    Copies every archived date from start to end (inclusive) into the
+    Firestore player logs. Re-running is harmless: each game is a merge
+    write keyed by game id. Returns the number of writes.
+    """
+    import pyarrow.dataset as ds
+    import storage
+
+    done = set(load_checkpoint(archive).get("done", []))
+    writes = 0
+    for date_str in _date_range(start, end):
+        if date_str not in done:
+            continue
+        df = load_history(ds.field("game_date") == date_str, archive, model_format=False)
+        games = [{"game_id": int(game_id), "game_date": date_str, "player_stats": rows.to_dict("records")}
+                 for game_id, rows in df.groupby("game_id", sort=True)]
+        if games:
+            writes += storage.save_player_logs(db, helpers.season_for_date(date_str), games)
+    return writes
+
+
+# --- Reading ---
+
+def _dataset(archive):
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+    return ds.dataset(archive, format="parquet", partitioning="hive", exclude_invalid_files=True)
+
+
+def to_model_logs(df):
+    """
+    Renames archive columns to the ones model.py expects and orders each
+    player's games most recent first.
+    """
+    logs = df.rename(columns=records.MODEL_COLUMNS)
+    if "tpm" in df.columns and "tpa" in df.columns:
+        tpa = df["tpa"].astype("float64")
+        logs["FG3_PCT"] = (df["tpm"].astype("float64") / tpa).where(tpa > 0, 0.0)
+    if "GAME_DATE" in logs.columns:
+        logs["GAME_DATE"] = logs["GAME_DATE"].astype(str)
+        logs = logs.sort_values(["PLAYER_ID", "GAME_DATE"], ascending=[True, False], kind="stable")
+    return logs.reset_index(drop=True)
+
+
+def load_history(filter_expr=None, archive=DEFAULT_ARCHIVE_PATH, columns=None, model_format=True):
+    """Reads rows matching a pyarrow.dataset filter expression."""
+    table = _dataset(archive).to_table(filter=filter_expr, columns=columns)
+    df = table.to_pandas()
+    return to_model_logs(df) if model_format else df
+
+
+def load_player_history(player_ids, archive=DEFAULT_ARCHIVE_PATH, columns=None, model_format=True):
+    """One or more players' full history, read with predicate pushdown."""
+    import pyarrow.dataset as ds
+    if not isinstance(player_ids, (list, tuple, set)):
+        player_ids = [player_ids]
+    return load_history(ds.field("player_id").isin(list(player_ids)), archive, columns, model_format)
+
+
+def load_team_history(team_name, archive=DEFAULT_ARCHIVE_PATH, columns=None, model_format=True):
+    """Every player row for one team, read with predicate pushdown."""
+    import pyarrow.dataset as ds
+    return load_history(ds.field("team_name") == team_name, archive, columns, model_format)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill the local game-log archive.")
+    parser.add_argument("--start", required=True, help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", default=(datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"),
+                        help="last date, YYYY-MM-DD (default: yesterday)")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_PATH, help="archive directory")
+    parser.add_argument("--player-logs", action="store_true",
+                        help="also copy the archived dates into the Firestore player logs")
+    args = parser.parse_args(argv)
+
+    backfill(args.start, args.end, args.archive)
+    if args.player_logs:
+        import get_data
+        db = get_data.get_firestore()
+        if db is None:
+            sys.exit(1)
+        sync_player_logs(db, args.start, args.end, args.archive)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    main()
@@ -0,0 +1,293 @@
+"""
+api/feature_store.py
+Incremental per-player feature state.
+Instead of re-reading a player's whole season log on every run, we keep
+running sums (for season averages) and the last 10 games (for the L10/L5
+windows) per player, and update them with each new game's stat lines.
+State is per season: a player's first game of a new season starts them
+over, so season averages never mix seasons.
+Reading a player's features is then O(1), and the dicts have the same keys
+as model.calculate_season_averages + calculate_recent_form, so they can be
+passed straight to model.build_enhanced_feature_vector(player_features=...).
+The prop snapshots read their feature table from here for every player the
+store is in sync with (see snapshots.slate_feature_table).
+"""
+
+import os
+import json
+import logging
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import helpers
+import model
+from records import parse_float, parse_minutes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.environ.get("FEATURE_STORE_PATH")
+
+# Longest window we need (L10); L5 is the first half of it
+RECENT_WINDOW = 10
+
+# Per-game values we track, in model.py column names
+STORE_COLS = ['PTS', 'AST', 'REB', 'FG3M', 'MIN', 'USG_APPROX', 'FGA', 'FTA', 'TOV', 'FG3_PCT']
+
+# Feature names and the STORE_COLS value each one averages
+_SEASON_KEYS = model._SEASON_KEYS
+_FORM_KEYS = model._FORM_KEYS
+
+
+def _usg(fga, fta, tov, mins):
+    if not mins:
+        return 0.0
+    usg = (fga + 0.44 * fta + tov) / mins
+    return usg if np.isfinite(usg) else 0.0
+
+
+def _season_of(game_date):
+    """The NBA season a game date falls in, or None if it isn't a YYYY-MM-DD date."""
+    try:
+        return helpers.season_for_date(game_date)
+    except (TypeError, ValueError):
+        return None
+
+
+def values_from_stat_line(stat_line):
+    """
+    Converts one helpers.get_player_stats_for_game row into the tracked
+    values, keyed by STORE_COLS. Rows saved before minutes were parsed
+    at ingestion ("34:12" strings) are handled too.
+    """
+    fga = parse_float(stat_line.get("fga"))
+    fta = parse_float(stat_line.get("fta"))
+    tov = parse_float(stat_line.get("turnovers"))
+    mins = parse_minutes(stat_line.get("min"))
+    tpm = parse_float(stat_line.get("tpm"))
+    tpa = parse_float(stat_line.get("tpa"))
+    return {
+        'PTS': parse_float(stat_line.get("pts")),
+        'AST': parse_float(stat_line.get("ast")),
+        'REB': parse_float(stat_line.get("reb")),
+        'FG3M': tpm,
+        'MIN': mins,
+        'USG_APPROX': _usg(fga, fta, tov, mins),
+        'FGA': fga,
+        'FTA': fta,
+        'TOV': tov,
+        'FG3_PCT': tpm / tpa if tpa else 0.0,
+    }
+
+
+def _json_default(value):
+    # game_ids sets; sorted so saving the same state gives the same file
+    if isinstance(value, set):
+        return sorted(value, key=str)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class FeatureStore:
+    """
+    Per-player state, for the player's latest season only:
+      season   - e.g. "2025-2026" (None if the games had no usable dates)
+      games    - number of games seen this season
+      sums     - running sum of each STORE_COLS value
+      recent   - up to RECENT_WINDOW [game_date, game_id, values] entries,
+                 most recent first
+      game_ids - set of this season's games already applied, so re-runs
+                 are no-ops (stored as a list in the JSON file)
+    """
+
+    def __init__(self, players=None):
+        self.players = players or {}
+
+    # --- Persistence ---
+
+    @classmethod
+    def load(cls, path=DEFAULT_STORE_PATH):
+        if not path or not os.path.exists(path):
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                players = json.load(f).get("players", {})
+            for state in players.values():
+                state["game_ids"] = set(state.get("game_ids", []))
+                state.setdefault("season", None)
+            return cls(players)
+        except Exception as e:
+            logger.error(f"Failed to load feature store {path}: {e}")
+            return cls()
+
+    def save(self, path=DEFAULT_STORE_PATH):
+        if not path:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"players": self.players}, f, default=_json_default)
+        os.replace(tmp_path, path)
+
+    # --- Updates ---
+
+    @staticmethod
+    def _new_state(season):
+        return {"season": season, "games": 0, "sums": {col: 0.0 for col in STORE_COLS},
+                "recent": [], "game_ids": set()}
+
+    def add_game(self, player_id, game_id, game_date, values, season=None):
+        """
+        Applies one game for one player. The season comes from game_date
+        unless given. A game from a newer season than the player's state
+        starts the state over; one from an older season is ignored.
+        Returns False if the game wasn't applied.
+        """
+        key = str(player_id)
+        season = season or _season_of(game_date)
+        state = self.players.get(key)
+        if state is None:
+            state = self._new_state(season)
+            self.players[key] = state
+        elif season is not None and state["season"] is not None and season != state["season"]:
+            # "2025-2026" style seasons sort in order
+            if season < state["season"]:
+                return False
+            state = self._new_state(season)
+            self.players[key] = state
+        elif state["season"] is None:
+            state["season"] = season
+
+        if game_id in state["game_ids"]:
+            return False
+
+        state["games"] += 1
+        for col in STORE_COLS:
+            state["sums"][col] += values[col]
+        state["game_ids"].add(game_id)
+
+        # Keep the window sorted by date so a late backfill lands in the right spot
+        row = [game_date, game_id, [values[col] for col in STORE_COLS]]
+        recent = state["recent"]
+        pos = 0
+        while pos < len(recent) and recent[pos][0] >= game_date:
+            pos += 1
+        recent.insert(pos, row)
+        del recent[RECENT_WINDOW:]
+        return True
+
+    def update_from_game(self, game, player_stats=None):
+        """
+        Applies every player's line from one game (a get_data game dict).
+        Returns how many players were updated.
+        """
+        player_stats = game.get("player_stats", []) if player_stats is None else player_stats
+        updated = 0
+        for stat_line in player_stats:
+            player_id = stat_line.get("player_id")
+            if player_id is None:
+                continue
+            if self.add_game(player_id, game["game_id"], game.get("game_date", ""), values_from_stat_line(stat_line)):
+                updated += 1
+        return updated
+
+    # --- Reads ---
+
+    def in_sync(self, player_id, season, games, latest_date):
+        """
+        True if the player's state is exactly `games` games of `season`,
+        the latest on latest_date, i.e. it matches logs with those counts.
+        """
+        state = self.players.get(str(player_id))
+        return (bool(state) and state["season"] == season and state["games"] == games
+                and bool(state["recent"]) and state["recent"][0][0] == latest_date)
+
+    def features(self, player_id):
+        """O(1) season/L10/L5 features for one player (zeros if unknown)."""
+        state = self.players.get(str(player_id))
+        if not state or not state["games"]:
+            return model.get_player_features(None, player_id)
+
+        n = state["games"]
+        features = {key: state["sums"][col] / n for key, col in _SEASON_KEYS}
+
+        recent = np.array([row[2] for row in state["recent"]], dtype=np.float64)
+        for last_n in (10, 5):
+            window = recent[:last_n]
+            means = window.mean(axis=0)
+            for key, col in _FORM_KEYS:
+                features[f'{key}_L{last_n}'] = float(means[STORE_COLS.index(col)])
+        return features
+
+    def feature_table(self, player_ids=None):
+        """Features for many players, shaped like model.build_feature_table."""
+        player_ids = list(self.players) if player_ids is None else list(player_ids)
+        rows = [self.features(player_id) for player_id in player_ids]
+        return pd.DataFrame(rows, index=pd.Index(player_ids, name=model.PLAYER_ID_COL))
+
+    # --- Full rebuild / verification ---
+
+    @classmethod
+    def rebuild_from_logs(cls, game_logs_df, player_col=model.PLAYER_ID_COL,
+                          game_id_col='GAME_ID', date_col='GAME_DATE'):
+        """
+        Builds a store from model-style logs (one row per player per game,
+        most recent first). Used to seed the store and to check it.
+        """
+        store = cls()
+        if game_logs_df is None or game_logs_df.empty:
+            return store
+
+        logs = game_logs_df.copy()
+        for col in ['FGA', 'FTA', 'TOV', 'MIN', 'PTS', 'AST', 'REB', 'FG3M', 'FG3_PCT']:
+            if col not in logs.columns:
+                logs[col] = 0
+            logs[col] = pd.to_numeric(logs[col], errors='coerce').fillna(0).astype(np.float64)
+        usg = (logs['FGA'] + 0.44 * logs['FTA'] + logs['TOV']) / logs['MIN']
+        logs['USG_APPROX'] = usg.replace([np.inf, -np.inf], 0).fillna(0)
+
+        if game_id_col not in logs.columns:
+            logs[game_id_col] = np.arange(len(logs))
+        if date_col not in logs.columns:
+            # No dates: rank by position so the first row stays the most recent
+            logs[date_col] = logs.groupby(player_col).cumcount(ascending=False).astype(str).str.zfill(6)
+
+        # Oldest first, so add_game sees games in the order they happened
+        for row in logs.iloc[::-1].itertuples(index=False):
+            row = row._asdict()
+            values = {col: float(row[col]) for col in STORE_COLS}
+            game_id = row[game_id_col]
+            game_id = game_id.item() if hasattr(game_id, "item") else game_id
+            store.add_game(row[player_col], game_id, str(row[date_col]), values)
+        return store
+
+    def reseed(self, game_logs_df, player_col=model.PLAYER_ID_COL):
+        """
+        Replaces the state of every player in the logs with a rebuild from
+        them (e.g. players the store fell out of sync with). Returns how
+        many players were reseeded.
+        """
+        rebuilt = self.rebuild_from_logs(game_logs_df, player_col)
+        self.players.update(rebuilt.players)
+        return len(rebuilt.players)
+
+    def verify(self, game_logs_df, player_col=model.PLAYER_ID_COL, date_col='GAME_DATE', tolerance=1e-9):
+        """
+        Compares the incremental state against a full recompute with
+        model.build_feature_table, over each player's logs from the season
+        their state is for. Returns {player_id: [mismatched keys]}.
+        """
+        if game_logs_df is not None and not game_logs_df.empty and date_col in game_logs_df.columns:
+            state_season = game_logs_df[player_col].map(
+                lambda player_id: (self.players.get(str(player_id)) or {}).get("season"))
+            game_season = game_logs_df[date_col].map(lambda game_date: _season_of(str(game_date)))
+            game_logs_df = game_logs_df[state_season.isna() | (state_season == game_season)]
+        expected = model.build_feature_table(game_logs_df, player_col)
+        mismatches = {}
+        for player_id, row in expected.iterrows():
+            actual = self.features(player_id)
+            bad = [key for key, value in row.items() if abs(actual.get(key, 0.0) - value) > tolerance]
+            if bad:
+                mismatches[player_id] = bad
+        return mismatches
@@ -1,13 +1,23 @@
 # THIS IS THE NEW, COMPLETE api/get_data.py FILE
 # Delete all old code in this file and replace it with this.
 
+import time
+
+# Measured so every run can report how long this module took to import
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 import sys
+import hmac
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dotenv import load_dotenv
-import firebase_admin
-from firebase_admin import credentials, firestore
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# firebase_admin, dotenv and pandas are imported lazily, only on the paths
+# that need them, so a serverless cold start doesn't pay for them up front
 
 # Add api directory to path to import helpers
 # This allows us to run `python api/get_data.py` from the root folder
@@ -15,6 +25,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
 # Import our new helper functions
 import helpers
+import instrumentation
+import storage
 
 # --- Setup ---
 # This makes our print messages clean
@@ -25,6 +37,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# How many `games/statistics` requests we allow in flight at the same time.
+# Each request can take up to 30s, so fetching them one by one blows
+# through the 60s Vercel limit on a big slate.
+STATS_FETCH_WORKERS = int(os.environ.get("STATS_FETCH_WORKERS", "6"))
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+# Kept at module level so warm serverless invocations reuse the client
+# (helpers does the same for its HTTP session)
+_db = None
+_invocations = 0
+
 # --- Firebase Initialization ---
 def initialize_firebase():
     """
@@ -32,6 +56,9 @@ def initialize_firebase():
     """
     logger.info("Initializing Firebase Admin...")
     try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
         # 1. Get the Firebase key from GitHub Secrets
         cred_json_string = os.environ.get("FIREBASE_ADMIN_KEY")
         if not cred_json_string:
@@ -54,59 +81,374 @@ def initialize_firebase():
         logger.error(f"Failed to initialize Firebase: {e}")
         return None
 
-# --- Main Bot Logic ---
-def main():
-    logger.info("--- BOT SCRIPT START (Using API-Basketball) ---")
-    
-    # 1. Initialize Firebase
-    db = initialize_firebase()
+def get_firestore(db=None):
+    """
+    Returns the given db, or the client from an earlier (warm) invocation,
+    or initializes Firebase for the first time. None if that fails.
+    """
+    global _db
+    if db is not None:
+        return db
+    if _db is None:
+        with instrumentation.stage("firebase_init"):
+            _db = initialize_firebase()
+    return _db
+
+# --- Player Stats Fetching ---
+def _fetch_game_stats(game):
+    """
+    Fetches stats for one game and returns (player_stats, error).
+    Never raises, so one bad game can't abort the whole batch.
+    """
+    game_id = game["game_id"]
+    finished = game.get("status") in helpers.FINISHED_GAME_STATUSES
+    try:
+        player_stats = helpers.get_player_stats_for_game(game_id, finished=finished)
+    except Exception as e:
+        logger.error(f"Failed to fetch player stats for game {game_id}: {e}")
+        return [], str(e)
+
+    if player_stats is None:
+        # helpers already logged why (HTTP error, timeout, API error, quota)
+        return [], "player stats request failed"
+    return player_stats, None
+
+
+def fetch_player_stats_concurrently(games, max_workers=STATS_FETCH_WORKERS):
+    """
+    Fills in `player_stats` for every game using a bounded thread pool.
+    At most `max_workers` requests run at once and the games keep their
+    original order. A game that fails gets an empty list plus a
+    `stats_error` message instead of stopping the other games.
+    Returns the list of game_ids that failed.
+    """
+    if max_workers <= 1 or len(games) <= 1:
+        results = [_fetch_game_stats(game) for game in games]
+    else:
+        workers = min(max_workers, len(games))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map() hands results back in the same order as games
+            results = list(pool.map(_fetch_game_stats, games))
+
+    failed = []
+    for game, (player_stats, error) in zip(games, results):
+        game["player_stats"] = player_stats
+        if error:
+            game["stats_error"] = error
+            failed.append(game["game_id"])
+
+    return failed
+
+# --- Feature Store ---
+def update_feature_store(games, path=None):
+    """
+    Appends finished games' stat lines to the incremental feature store
+    (only when FEATURE_STORE_PATH is set). Live games are skipped so a
+    half-played box score never lands in a player's averages.
+    """
+    # Check the path before importing: feature_store pulls in pandas
+    path = path or os.environ.get("FEATURE_STORE_PATH")
+    if not path:
+        return 0
+
+    import feature_store
+
+    store = feature_store.FeatureStore.load(path)
+    updated = 0
+    for game in games:
+        if game.get("status") in helpers.FINISHED_GAME_STATUSES:
+            updated += store.update_from_game(game)
+
+    if updated:
+        store.save(path)
+    logger.info(f"Feature store: applied {updated} new player games.")
+    return updated
+
+# --- Prop Snapshots ---
+def update_player_logs(db, date_str, games):
+    """
+    Appends the finished games that have stats to the season's player
+    logs in Firestore, the history the prop snapshots are built from.
+    Live games are skipped, like in the feature store.
+    """
+    finished = [game for game in games
+                if game.get("status") in helpers.FINISHED_GAME_STATUSES
+                and game.get("player_stats") and not game.get("stats_error")]
+    if not finished:
+        return 0
+    return storage.save_player_logs(db, helpers.season_for_date(date_str), finished)
+
+
+def publish_prop_snapshots(db, date_str, games):
+    """
+    Scores every player on the slate from their Firestore player logs and
+    saves one pre-sorted snapshot per stat (see snapshots.py). When
+    FEATURE_STORE_PATH is set, features come from the store for every
+    player it's in sync with (the rest are reseeded). Returns
+    save_prop_snapshots' result, or None if pandas isn't installed.
+    """
+    try:
+        import snapshots
+    except ImportError as e:
+        logger.info(f"Prop snapshots need pandas ({e}); skipping.")
+        return None
+
+    store = None
+    path = os.environ.get("FEATURE_STORE_PATH")
+    if path:
+        import feature_store
+        store = feature_store.FeatureStore.load(path)
+
+    boards = snapshots.build_slate_snapshots(db, games, date_str, feature_store=store)
+    if store is not None:
+        # Keeps the players the snapshots had to reseed
+        store.save(path)
+    return storage.save_prop_snapshots(db, date_str, boards)
+
+
+def refresh_prop_data(db, date_str, games, only_if_missing=False):
+    """
+    Player logs, then the prop snapshots read from them; neither stops the
+    run. only_if_missing=True skips the snapshots if the day has them.
+    """
+    try:
+        with instrumentation.stage("player_logs"):
+            update_player_logs(db, date_str, games)
+    except Exception as e:
+        logger.error(f"Failed to update player logs: {e}")
+
+    try:
+        with instrumentation.stage("prop_snapshots"):
+            if only_if_missing and storage.load_snapshot_versions(db, date_str):
+                return
+            publish_prop_snapshots(db, date_str, games)
+    except Exception as e:
+        logger.error(f"Failed to publish prop snapshots: {e}")
+
+# --- Incremental Refresh ---
+def _game_state(game):
+    return (game.get("status"), game.get("home_score"), game.get("away_score"))
+
+
+def _has_stats(game):
+    return game.get("status") in helpers.LIVE_GAME_STATUSES or game.get("status") in helpers.FINISHED_GAME_STATUSES
+
+
+def _missing_stats(stored):
+    """A stored live/finished game whose stats failed or came back empty."""
+    return _has_stats(stored) and (bool(stored.get("stats_error")) or not stored.get("player_count"))
+
+
+def select_changed_games(games, stored_index):
+    """
+    Compares the latest scoreboard with what we stored last time.
+    Returns (to_fetch, to_write):
+      to_fetch - live or finished games whose status/score changed, or
+                 whose stored copy has no stats (these need a fresh
+                 `games/statistics` call)
+      to_write - every game whose state changed, including new games that
+                 haven't started (those are written without stats)
+    Unchanged games are in neither list: no stats request, no write.
+    """
+    to_fetch, to_write = [], []
+    for game in games:
+        stored = stored_index.get(str(game["game_id"]))
+        if stored is not None and _game_state(stored) == _game_state(game) and not _missing_stats(stored):
+            continue
+
+        to_write.append(game)
+        if _has_stats(game):
+            to_fetch.append(game)
+
+    return to_fetch, to_write
+
+
+def is_incremental_run(argv=None):
+    """`--incremental` on the command line or GET_DATA_MODE=incremental."""
+    argv = sys.argv[1:] if argv is None else argv
+    return "--incremental" in argv or os.environ.get("GET_DATA_MODE", "").lower() == "incremental"
+
+
+def run_incremental(db, today_str):
+    """
+    Intra-day refresh: only re-fetch and re-write games whose state moved
+    since the last stored run. Returns the db it used (None if there were
+    no games, in which case Firebase was never initialized).
+    """
+    # Always read the live scoreboard here; it's what tells us what changed
+    games = helpers.get_upcoming_games(days=1, use_cache=False)
+    if games is None:
+        logger.error("Failed to fetch today's scoreboard. Bot finished.")
+        return db
+    if not games:
+        logger.info("No games scheduled for today. Bot finished.")
+        return db
+
+    db = get_firestore(db)
     if db is None:
         sys.exit(1) # Exit with an error
 
-    # 2. Get Today's Games
-    # This is our first API call (1 request)
+    with instrumentation.stage("firestore_load_index"):
+        stored_index = storage.load_index(db, today_str)
+    to_fetch, to_write = select_changed_games(games, stored_index)
+    logger.info(f"Incremental refresh: {len(to_fetch)} games need stats, "
+                f"{len(to_write)} changed, {len(games) - len(to_write)} unchanged.")
+
+    if not to_write:
+        return db
+
+    failed = set(fetch_player_stats_concurrently(to_fetch))
+    # A live or finished game with no stats yet (box score not published)
+    # counts as failed too
+    failed |= {game["game_id"] for game in to_fetch if not game.get("player_stats")}
+    if failed:
+        # Don't store their new state, so the next run tries them again
+        logger.warning(f"Player stats failed or empty for {len(failed)} games: {sorted(failed)}")
+        to_write = [game for game in to_write if game["game_id"] not in failed]
+
+    try:
+        with instrumentation.stage("feature_store"):
+            update_feature_store(to_fetch)
+    except Exception as e:
+        logger.error(f"Failed to update feature store: {e}")
+
+    try:
+        with instrumentation.stage("firestore_save"):
+            storage.save_slate(db, today_str, to_write, existing_index=stored_index)
+    except Exception as e:
+        logger.error(f"Failed to save data to Firestore: {e}")
+
+    # Games that just went final join the player logs (unchanged games
+    # carry no player_stats here). Snapshots only use games before today,
+    # so they're built once a day: by this run if the full one hasn't yet.
+    refresh_prop_data(db, today_str, games, only_if_missing=True)
+    return db
+
+# --- Main Bot Logic ---
+def main(incremental=None, db=None):
+    # db: an already-initialized Firestore client (or a stand-in for
+    # offline replays); by default we initialize Firebase ourselves
+    logger.info("--- BOT SCRIPT START (Using API-Basketball) ---")
+    if incremental is None:
+        incremental = is_incremental_run()
+
+    global _invocations
+    _invocations += 1
+
+    metrics = instrumentation.start_run()
+    metrics.extra["mode"] = "incremental" if incremental else "full"
+    metrics.extra["cold_start"] = _invocations == 1
+    metrics.extra["import_seconds"] = IMPORT_SECONDS
+    try:
+        db = run(db, incremental)
+    finally:
+        # One JSON summary per run: where the time, bytes and retries went
+        metrics.extra["api"] = helpers.get_api_stats()
+        summary = instrumentation.emit(db=db)
+        logger.info("--- BOT SCRIPT END ---")
+    return summary
+
+
+def run(db, incremental):
+    """Runs one full or incremental refresh. Returns the db it used."""
+    if incremental:
+        return run_incremental(db, datetime.now().strftime("%Y-%m-%d"))
+
+    # 1. Get Today's Games
+    # This is our first API call (1 request). We check for games before
+    # touching Firebase, so an empty day never pays for initializing it.
     games = helpers.get_upcoming_games(days=1)
-    
+
+    if games is None:
+        logger.error("Failed to fetch today's scoreboard. Bot finished.")
+        return db
     if not games:
         logger.info("No games scheduled for today. Bot finished.")
-        return
+        return db
+
+    # 2. Initialize Firebase (reused across warm invocations)
+    db = get_firestore(db)
+    if db is None:
+        sys.exit(1) # Exit with an error
 
     logger.info(f"Found {len(games)} games. Fetching player stats for each...")
 
-    all_games_data = []
+    # 3. Get player stats for all games at once (1 request *per game*)
+    # The whole batch takes about as long as the slowest single request.
+    failed = fetch_player_stats_concurrently(games)
+    if failed:
+        logger.warning(f"Player stats failed for {len(failed)} games: {failed}")
 
-    # 3. Loop through each game and get player stats
-    for game in games:
-        game_id = game["game_id"]
-        
-        # This is our loop of API calls (1 request *per game*)
-        player_stats = helpers.get_player_stats_for_game(game_id)
-        
-        # Add the player stats to our game object
-        game["player_stats"] = player_stats
-        all_games_data.append(game)
+    all_games_data = games
 
-    # 4. Save all data to Firebase
     try:
-        # Create a single document for today's data
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        doc_ref = db.collection("nba_games").document(today_str)
-        
-        # We'll save a big object that contains all of today's games
-        doc_ref.set({
-            "games": all_games_data,
-            "last_updated": firestore.SERVER_TIMESTAMP
-        })
-        
-        logger.info(f"Successfully saved all data to Firestore document: {today_str}")
+        with instrumentation.stage("feature_store"):
+            update_feature_store(all_games_data)
+    except Exception as e:
+        logger.error(f"Failed to update feature store: {e}")
+
+    # 4. Save to Firebase: one small index doc + one doc per game.
+    # Games whose content didn't change since the last run aren't rewritten.
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    try:
+        with instrumentation.stage("firestore_save"):
+            result = storage.save_slate(db, today_str, all_games_data)
+        logger.info(f"Successfully saved {len(result['written'])} games to Firestore for {today_str}")
         
     except Exception as e:
         logger.error(f"Failed to save data to Firestore: {e}")
 
-    logger.info("--- BOT SCRIPT END ---")
+    # 5. Add finished games to the player logs and precompute the per-stat
+    # prop boards the frontend reads
+    refresh_prop_data(db, today_str, all_games_data)
+
+    return db
+
+# --- Vercel Entry Point ---
+def is_authorized(authorization):
+    """
+    Vercel sends crons `Authorization: Bearer $CRON_SECRET`. Anything else
+    (including every request when CRON_SECRET isn't set) is refused, so a
+    stray hit on an /api/ URL can't start a paid run.
+    """
+    secret = os.environ.get("CRON_SECRET")
+    if not secret or not authorization:
+        return False
+    return hmac.compare_digest(authorization.encode("utf-8"), f"Bearer {secret}".encode("utf-8"))
+
+
+class handler(BaseHTTPRequestHandler):
+    """
+    Vercel calls this for /api/get_data (the cron hits it with a GET).
+    Add ?mode=incremental for an intra-day refresh. Only requests carrying
+    the cron secret start a run; the run summary stays in the logs.
+    """
+
+    def do_GET(self):
+        if not is_authorized(self.headers.get("Authorization")):
+            status, body = 401, {"ok": False, "error": "Unauthorized"}
+        else:
+            query = parse_qs(urlparse(self.path).query)
+            incremental = query.get("mode", [""])[0] == "incremental"
+            try:
+                summary = main(incremental=incremental)
+                status, body = 200, {"ok": True, "run_id": (summary or {}).get("run_id")}
+            except SystemExit:
+                status, body = 500, {"ok": False, "error": "Firebase initialization failed"}
+            except Exception as e:
+                logger.error(f"Bot run failed: {e}")
+                status, body = 500, {"ok": False, "error": "Bot run failed"}
+
+        payload = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
 
 if __name__ == "__main__":
     # This allows you to test the script locally
     # It will load secrets from a file named ".env"
+    from dotenv import load_dotenv
     load_dotenv()
     main()
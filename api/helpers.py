@@ -2,10 +2,19 @@
 # Delete all old code in this file and replace it with this.
 
 import os
+import random
 import requests
 import logging
 import sys
+import threading
+import time
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+
+import instrumentation
+import records
+import response_cache
+from response_cache import NEVER_EXPIRES
 
 # --- Setup ---
 # Set up a simple logger to print messages
@@ -20,7 +29,8 @@ logger = logging.getLogger(__name__)
 # We get the API key from the GitHub Secrets (via os.environ)
 API_KEY = os.environ.get("RAPIDAPI_KEY")
 API_HOST = "api-basketball.p.rapidapi.com"
-BASE_URL = "https://v1.basketball.api-sports.io"
+# Can be pointed at a local stand-in (see benchmarks/replay.py)
+BASE_URL = os.environ.get("API_BASKETBALL_URL", "https://v1.basketball.api-sports.io")
 
 # We must send these headers with every single request
 HEADERS = {
@@ -35,56 +45,376 @@ NBA_LEAGUE_ID = 12
 CURRENT_SEASON = "2025-2026"
 
 
-def _api_request_wrapper(endpoint, params):
+def season_for_date(date_str):
+    """NBA seasons start in October: 2026-01-15 -> "2025-2026"."""
+    day = datetime.strptime(date_str, "%Y-%m-%d")
+    start_year = day.year if day.month >= 8 else day.year - 1
+    return f"{start_year}-{start_year + 1}"
+
+
+# Game statuses that mean the box score is final and will never change
+FINISHED_GAME_STATUSES = {"FT", "AOT"}
+# Game statuses while a game is being played (quarters, overtime, breaks)
+LIVE_GAME_STATUSES = {"Q1", "Q2", "Q3", "Q4", "OT", "BT", "HT"}
+# Games that won't be played on their date (postponed, cancelled,
+# abandoned, awarded); they never get a box score
+NOT_PLAYED_GAME_STATUSES = {"POST", "CANC", "ABD", "AWD"}
+
+# --- RESPONSE CACHE SETTINGS ---
+# Today's scoreboard changes during the day, so only keep it a few minutes.
+# Stats for a game in progress are only reused for a minute.
+# Finished games and past scoreboards where every game is over never expire.
+SCOREBOARD_TTL_SECONDS = int(os.environ.get("API_SCOREBOARD_TTL_SECONDS", "300"))
+LIVE_STATS_TTL_SECONDS = int(os.environ.get("API_LIVE_STATS_TTL_SECONDS", "60"))
+CACHE_BYPASS = os.environ.get("API_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+_cache = response_cache.ResponseCache()
+
+# Returned by _fetch_from_api when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+
+# --- HTTP CLIENT SETTINGS ---
+# Retry 429s and server errors a few times with jittered exponential backoff
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Steady request rate for the token bucket (and how many we can burst)
+REQUESTS_PER_SECOND = float(os.environ.get("API_REQUESTS_PER_SECOND", "5"))
+REQUEST_BURST = int(os.environ.get("API_REQUEST_BURST", "6"))
+
+# Once fewer than this many requests are left for the day we start slowing
+# down, so we run out gradually instead of failing halfway through a slate
+QUOTA_SLOWDOWN_THRESHOLD = int(os.environ.get("API_QUOTA_SLOWDOWN_THRESHOLD", "25"))
+QUOTA_MIN_RATE_FRACTION = 0.1
+
+# Once the quota reads 0 we stop sending requests, but the daily quota
+# resets (at midnight UTC), so every this-many seconds, and on a new UTC
+# day, one probe request is let through to re-read the quota headers
+QUOTA_PROBE_SECONDS = int(os.environ.get("API_QUOTA_PROBE_SECONDS", "900"))
+
+
+class _RequestThrottle:
     """
-    A robust wrapper for making all requests to API-Basketball.
-    This will handle errors and check our remaining quota.
+    A thread-safe token bucket for API-Basketball requests.
+    It also remembers the quota headers from the last response and lowers
+    the request rate as the daily quota gets close to zero.
     """
-    if not API_KEY:
-        logger.error("RAPIDAPI_KEY is not set. Bot cannot run.")
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.quota_remaining = None
+        self.quota_limit = None
+        self.quota_seen_at = None
+        self.lock = threading.Lock()
+
+    def _current_rate(self):
+        remaining = self.quota_remaining
+        if remaining is None or remaining >= QUOTA_SLOWDOWN_THRESHOLD:
+            return self.rate
+        fraction = max(remaining / QUOTA_SLOWDOWN_THRESHOLD, QUOTA_MIN_RATE_FRACTION)
+        return self.rate * fraction
+
+    def quota_exhausted(self):
+        """
+        True while the last quota we saw was 0. A warm process would
+        otherwise stay locked out after the daily reset, so once the UTC
+        day changes or QUOTA_PROBE_SECONDS pass, this returns False once
+        to let a probe request through.
+        """
+        with self.lock:
+            if self.quota_remaining is None or self.quota_remaining > 0:
+                return False
+            now = time.time()
+            new_day = time.gmtime(now)[:3] != time.gmtime(self.quota_seen_at)[:3]
+            if new_day or now - self.quota_seen_at >= QUOTA_PROBE_SECONDS:
+                # Only one probe per interval; its response updates the quota
+                self.quota_seen_at = now
+                return False
+            return True
+
+    def out_of_quota(self):
+        """True if the last response said no requests are left today."""
+        with self.lock:
+            return self.quota_remaining == 0
+
+    def update_quota(self, headers):
+        remaining = headers.get("x-ratelimit-requests-remaining")
+        limit = headers.get("x-ratelimit-requests-limit")
+        with self.lock:
+            if remaining is not None and str(remaining).isdigit():
+                self.quota_remaining = int(remaining)
+                self.quota_seen_at = time.time()
+            if limit is not None and str(limit).isdigit():
+                self.quota_limit = int(limit)
+
+    def reset_quota(self):
+        with self.lock:
+            self.quota_remaining = None
+            self.quota_limit = None
+            self.quota_seen_at = None
+
+    def acquire(self):
+        """Blocks until a request may be sent. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                rate = self._current_rate()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / rate
+            time.sleep(wait)
+            waited += wait
+
+
+_throttle = _RequestThrottle(REQUESTS_PER_SECOND, REQUEST_BURST)
+
+# Counters so we can see where the cron time goes
+_api_stats_lock = threading.Lock()
+_api_stats = {
+    "requests": 0,
+    "retries": 0,
+    "cache_hits": 0,
+    "cache_revalidations": 0,
+    "throttle_wait_seconds": 0.0,
+    "backoff_wait_seconds": 0.0,
+}
+
+# One shared session = keep-alive connections instead of a new TLS
+# handshake for every request
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+    return _session
+
+
+def _record_stat(key, amount):
+    with _api_stats_lock:
+        _api_stats[key] += amount
+
+
+def get_api_stats():
+    """
+    Returns a snapshot of the request counters, including the
+    quota left for the day (None until we've seen a response).
+    """
+    with _api_stats_lock:
+        stats = dict(_api_stats)
+    stats["quota_remaining"] = _throttle.quota_remaining
+    stats["quota_limit"] = _throttle.quota_limit
+    return stats
+
+
+def reset_api_stats():
+    """Zeroes the counters and forgets the last quota we saw."""
+    with _api_stats_lock:
+        for key in _api_stats:
+            _api_stats[key] = 0.0 if key.endswith("_seconds") else 0
+    _throttle.reset_quota()
+
+
+def _backoff(attempt, endpoint, reason, retry_after=None):
+    """Sleeps before the next retry using full-jitter exponential backoff."""
+    delay = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, BACKOFF_MAX_SECONDS))
+    logger.warning(f"Retrying {endpoint} in {delay:.1f}s ({reason}, attempt {attempt + 1}/{MAX_RETRIES})")
+    _record_stat("retries", 1)
+    instrumentation.add(f"api:{endpoint}", retries=1, backoff_seconds=delay)
+    _record_stat("backoff_wait_seconds", delay)
+    time.sleep(delay)
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
         return None
 
+
+def _transferred_bytes(response):
+    """Bytes that came over the wire (compressed), not the decoded body size."""
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length)
     try:
-        url = f"https{BASE_URL}/{endpoint}"
-        # This is the actual API call
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        
-        # Raise an error if the request failed (e.g., 404, 500)
-        response.raise_for_status() 
-        
-        data = response.json()
-        
-        # Check if the API itself sent an error message
-        if data.get("errors"):
-            logger.error(f"API Error for {endpoint}: {data['errors']}")
-            return None
-            
+        # urllib3 counts what it read from the socket, before decoding
+        return int(response.raw.tell())
+    except Exception:
+        return len(response.content)
+
+
+def _fetch_from_api(endpoint, params, cached=None):
+    """
+    Makes the actual request. Uses the shared session, waits for the
+    throttle, retries 429s and server errors with backoff, and keeps
+    track of our remaining quota.
+    If a stale cache entry is passed in we send its ETag/Last-Modified,
+    and a 304 comes back as NOT_MODIFIED.
+    Returns (payload, response_headers), or (None, None) on failure.
+    """
+    if _throttle.quota_exhausted():
+        logger.error(f"Daily API quota is used up. Skipping {endpoint}.")
+        return None, None
+
+    url = f"{BASE_URL}/{endpoint}"
+    session = _get_session()
+
+    conditional_headers = {}
+    if cached is not None:
+        if cached.etag:
+            conditional_headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            conditional_headers["If-Modified-Since"] = cached.last_modified
+
+    for attempt in range(MAX_RETRIES + 1):
+        _record_stat("throttle_wait_seconds", _throttle.acquire())
+        _record_stat("requests", 1)
+
+        try:
+            # This is the actual API call
+            response = session.get(url, params=params, headers=conditional_headers, timeout=30)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            if attempt < MAX_RETRIES:
+                _backoff(attempt, endpoint, type(e).__name__)
+                continue
+            logger.error(f"Request failed for {endpoint} after {MAX_RETRIES} retries: {e}")
+            return None, None
+        except Exception as e:
+            logger.error(f"Failed to fetch {endpoint}: {e}")
+            return None, None
+
+        _throttle.update_quota(response.headers)
+        instrumentation.add(f"api:{endpoint}", requests=1, bytes=_transferred_bytes(response),
+                            body_bytes=len(response.content))
+
+        if response.status_code == 304 and cached is not None:
+            return NOT_MODIFIED, response.headers
+
+        if response.status_code == 429 and _throttle.out_of_quota():
+            # Retrying can't help until the daily quota resets
+            logger.error(f"Daily API quota is used up (HTTP 429 for {endpoint}).")
+            return None, None
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+            _backoff(attempt, endpoint, f"HTTP {response.status_code}", _retry_after_seconds(response))
+            continue
+
+        try:
+            # Raise an error if the request failed (e.g., 404, 500)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"HTTP Error for {endpoint}: {e.response.status_code} {e.response.text}")
+            return None, None
+        except Exception as e:
+            logger.error(f"Failed to fetch {endpoint}: {e}")
+            return None, None
+
+        # Check if the API itself sent an error message.
+        # A per-minute rate limit comes back as a 200 with a "rateLimit" error.
+        errors = data.get("errors")
+        if errors:
+            if isinstance(errors, dict) and "rateLimit" in errors and attempt < MAX_RETRIES:
+                _backoff(attempt, endpoint, "rateLimit")
+                continue
+            logger.error(f"API Error for {endpoint}: {errors}")
+            return None, None
+
         # Check our remaining requests for the day
         remaining = response.headers.get('x-ratelimit-requests-remaining')
         if remaining:
             logger.info(f"API requests remaining today: {remaining}")
-            
-        return data.get("response", [])
-        
-    except requests.exceptions.Timeout:
-        logger.error(f"Request Timed Out for {endpoint}.")
-        return None
-    except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP Error for {endpoint}: {e.response.status_code} {e.response.text}")
-        return None
-    except Exception as e:
-        logger.error(f"Failed to fetch {endpoint}: {e}")
+
+        return data.get("response", []), response.headers
+
+    return None, None
+
+
+def _api_request_wrapper(endpoint, params, ttl=0, use_cache=True, settled=bool):
+    """
+    A robust wrapper for making all requests to API-Basketball.
+    Answers from the on-disk cache when it can, otherwise calls the API
+    and stores the result for `ttl` seconds (NEVER_EXPIRES = forever,
+    0 = don't cache). Set API_CACHE_BYPASS=1 or use_cache=False to
+    always go to the API.
+    A payload is only kept forever if settled(payload) is true (by
+    default: it isn't empty); otherwise it gets the short live TTL.
+    """
+    with instrumentation.stage(f"api:{endpoint}"):
+        return _cached_api_request(endpoint, params, ttl, use_cache, settled)
+
+
+def _cached_api_request(endpoint, params, ttl, use_cache, settled=bool):
+    use_cache = use_cache and not CACHE_BYPASS and ttl != 0
+
+    cached = _cache.get(endpoint, params) if use_cache else None
+    # An entry kept forever before it had settled (by an older version of
+    # this code) is checked against the API again instead of trusted
+    pinned_too_early = cached is not None and cached.expires_at is None and not settled(cached.payload)
+    if cached is not None and cached.fresh and not pinned_too_early:
+        _record_stat("cache_hits", 1)
+        instrumentation.add(f"api:{endpoint}", cache_hits=1)
+        return cached.payload
+
+    if not API_KEY:
+        logger.error("RAPIDAPI_KEY is not set. Bot cannot run.")
         return None
 
+    payload, headers = _fetch_from_api(endpoint, params, cached)
+
+    # An unsettled answer to a request we'd otherwise keep forever (an empty
+    # box score right after the final buzzer, a past scoreboard with a game
+    # still in progress) can still change, so it only gets the short live TTL
+    body = cached.payload if payload is NOT_MODIFIED else payload
+    if ttl is NEVER_EXPIRES and body is not None and not settled(body):
+        ttl = LIVE_STATS_TTL_SECONDS
+
+    if payload is NOT_MODIFIED:
+        _record_stat("cache_revalidations", 1)
+        _cache.refresh(endpoint, params, cached, ttl)
+        return cached.payload
+
+    if payload is not None and use_cache:
+        _cache.set(
+            endpoint, params, payload, ttl,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+
+    return payload
+
 # -----------------------
 # REWRITTEN FUNCTIONS
 # -----------------------
 
-def get_upcoming_games(days=1):
+def get_upcoming_games(days=1, use_cache=True):
     """
     Gets upcoming games for today.
     This replaces the old 'ScoreboardV2' function.
     This uses 1 API Request.
+    Pass use_cache=False to always get the live scoreboard.
+    Returns None if the request failed.
     """
     logger.info(f"Fetching scoreboard for today...")
     
@@ -92,22 +422,46 @@ def get_upcoming_games(days=1):
     # (Note: API-Sports may be 1 day behind, so you might
     # want to fetch for `yesterday` if you run this in the morning)
     today_str = (datetime.now()).strftime("%Y-%m-%d")
-    
+
+    games_list = get_games_for_date(today_str, use_cache=use_cache)
+    if games_list:
+        logger.info(f"Found {len(games_list)} upcoming games.")
+    return games_list
+
+
+def _scoreboard_settled(games):
+    """Every game on the scoreboard is final, or won't be played."""
+    over = FINISHED_GAME_STATUSES | NOT_PLAYED_GAME_STATUSES
+    return bool(games) and all((game.get("status") or {}).get("short") in over for game in games)
+
+
+def get_games_for_date(date_str, season=CURRENT_SEASON, use_cache=True):
+    """
+    Gets all games on one date (YYYY-MM-DD), formatted like our old structure.
+    Today's (or a future) scoreboard is only cached for a few minutes.
+    A past scoreboard is cached forever once every game on it is over
+    (see _scoreboard_settled); until then it's re-checked like live data.
+    This uses 1 API Request (0 if cached).
+    Returns None if the request failed, [] if there are no games.
+    """
     params = {
         "league": NBA_LEAGUE_ID,
-        "season": CURRENT_SEASON,
-        "date": today_str
+        "season": season,
+        "date": date_str
     }
-    
+
+    is_past = date_str < datetime.now().strftime("%Y-%m-%d")
+    ttl = NEVER_EXPIRES if is_past else SCOREBOARD_TTL_SECONDS
+
     # Call the API
-    games = _api_request_wrapper("games", params)
+    games = _api_request_wrapper("games", params, ttl=ttl, use_cache=use_cache, settled=_scoreboard_settled)
     
     if games is None:
-        logger.error("Failed to fetch games.")
-        return []
+        logger.error(f"Failed to fetch games for {date_str}.")
+        return None
     
     if not games:
-        logger.info(f"No games found on {today_str}")
+        logger.info(f"No games found on {date_str}")
         return []
 
     # Format the data to match our old structure
@@ -115,32 +469,62 @@ def get_upcoming_games(days=1):
     for game in games:
         game_data = {
             "game_id": game["id"],
-            "game_date": today_str,
+            "game_date": date_str,
             "home": game["teams"]["home"]["code"],
             "away": game["teams"]["visitors"]["code"],
             "home_team_name": game["teams"]["home"]["name"],
             "away_team_name": game["teams"]["visitors"]["name"],
             "game_description": f"{game['teams']['visitors']['code']} @ {game['teams']['home']['code']}",
+            "status": (game.get("status") or {}).get("short"),
+            "home_score": ((game.get("scores") or {}).get("home") or {}).get("total"),
+            "away_score": ((game.get("scores") or {}).get("visitors") or {}).get("total"),
             "player_stats": [] # We will fill this in the main script
         }
         games_list.append(game_data)
 
-    logger.info(f"Found {len(games_list)} upcoming games.")
     return games_list
 
 
-def get_player_stats_for_game(game_id):
+def get_player_stats_for_game(game_id, finished=False):
     """
     Gets all player stats for a single game.
     This replaces the old 'playergamelog' function.
-    This uses 1 API Request *per game*.
+    This uses 1 API Request *per game* (0 if the game is finished
+    and we already have it cached).
+    Minutes come back as floats and counts as ints (see records.py).
+    Returns None if the request failed; an empty list means the API
+    answered but has no stats for the game (yet).
     """
+    lines = get_player_stat_lines(game_id, finished)
+    if lines is None:
+        return None
+    return [line.to_dict() for line in lines]
+
+
+def get_player_stat_lines(game_id, finished=False):
+    """
+    Same as get_player_stats_for_game, but returns compact PlayerStatLine
+    records that can be bulk-converted with records.to_frame /
+    records.to_structured_array.
+    """
+    with instrumentation.stage("player_stats"):
+        return _get_player_stat_lines(game_id, finished)
+
+
+def _get_player_stat_lines(game_id, finished):
     logger.info(f"Fetching player stats for game {game_id}...")
     
     params = {"league": NBA_LEAGUE_ID, "id": game_id}
-    
-    data = _api_request_wrapper("games/statistics", params)
-    
+
+    # A finished game's box score never changes, so cache it forever
+    ttl = NEVER_EXPIRES if finished else LIVE_STATS_TTL_SECONDS
+    data = _api_request_wrapper("games/statistics", params, ttl=ttl)
+
+    if data is None:
+        # HTTP/timeout/API error or no quota left: let the caller retry later
+        logger.error(f"Failed to fetch player stats for game {game_id}.")
+        return None
+
     if not data:
         logger.warning(f"No player stats found for game {game_id}")
         return []
@@ -152,28 +536,8 @@ def get_player_stats_for_game(game_id):
     for team_stats in data:
         team_name = team_stats["team"]["name"]
         for player_stat in team_stats["statistics"]:
-            player_info = player_stat.get("player", {})
-            
-            # Format the data to be easy to save in Firebase
-            formatted_stat = {
-                "player_id": player_info.get("id"),
-                "player_name": f"{player_info.get('firstname')} {player_info.get('lastname')}",
-                "team_name": team_name,
-                "min": player_stat.get("min"),
-                "pts": player_stat.get("points"),
-                "reb": player_stat.get("totReb"),
-                "ast": player_stat.get("assists"),
-                "stl": player_stat.get("steals"),
-                "blk": player_stat.get("blocks"),
-                "turnovers": player_stat.get("turnovers"),
-                "fgm": player_stat.get("fgm"),
-                "fga": player_stat.get("fga"),
-                "tpm": player_stat.get("tpm"), # 3-pointers made
-                "tpa": player_stat.get("tpa"), # 3-pointers attempted
-                "ftm": player_stat.get("ftm"), # Free throws made
-                "fta": player_stat.get("fta"), # Free throws attempted
-            }
-            all_player_stats.append(formatted_stat)
+            # Parse everything once here so nothing downstream has to
+            all_player_stats.append(records.PlayerStatLine.from_api(player_stat, team_name))
 
     logger.info(f"Found stats for {len(all_player_stats)} players in game {game_id}.")
     return all_player_stats
@@ -0,0 +1,163 @@
+"""
+api/instrumentation.py
+Per-stage timing and resource counters for one bot run.
+
+Wrap a piece of work in `with instrumentation.stage("name"):` and it records
+how many times it ran, total and max duration, the wall-clock span from the
+first start to the last end (stages can run in parallel threads), and how
+much the process's resident memory grew while it ran (rss_growth_mb, summed
+over its runs; memory other threads allocate meanwhile counts too). Extra
+counters (bytes, retries, ...) are added with instrumentation.add(). At the
+end of a run, summary() returns one JSON-ready dict that is logged and, if
+PIPELINE_RUN_LOG is set, written to Firestore. Its process_peak_rss_mb is
+the process's high-water mark, which on a warm serverless instance includes
+earlier runs.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Firestore collection for run summaries. Off unless set (e.g.
+# PIPELINE_RUN_LOG=pipeline_runs): every run would otherwise cost a write,
+# including the incremental runs that change nothing.
+RUN_LOG_COLLECTION = os.environ.get("PIPELINE_RUN_LOG", "")
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    divisor = 1024 * 1024 if os.uname().sysname == "Darwin" else 1024
+    return peak / divisor
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mb():
+    """Resident memory of this process right now, in MB (None if unknown)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # No /proc (macOS, Windows)
+        return None
+
+
+class RunMetrics:
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._start = time.perf_counter()
+        self._stages = {}
+        self._lock = threading.Lock()
+        self.extra = {}
+
+    def _stage_record(self, name):
+        record = self._stages.get(name)
+        if record is None:
+            record = {"count": 0, "seconds": 0.0, "max_seconds": 0.0,
+                      "first_start": None, "last_end": None, "rss_growth_mb": None}
+            self._stages[name] = record
+        return record
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        rss_before = current_rss_mb()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            rss_after = current_rss_mb()
+            with self._lock:
+                record = self._stage_record(name)
+                duration = end - start
+                record["count"] += 1
+                record["seconds"] += duration
+                record["max_seconds"] = max(record["max_seconds"], duration)
+                if record["first_start"] is None or start < record["first_start"]:
+                    record["first_start"] = start
+                if record["last_end"] is None or end > record["last_end"]:
+                    record["last_end"] = end
+                if rss_before is not None and rss_after is not None:
+                    record["rss_growth_mb"] = (record["rss_growth_mb"] or 0.0) + rss_after - rss_before
+
+    def add(self, name, **counters):
+        """Adds to a stage's counters, e.g. add("api:games", bytes=1234)."""
+        with self._lock:
+            record = self._stage_record(name)
+            for key, value in counters.items():
+                record[key] = record.get(key, 0) + value
+
+    def summary(self):
+        with self._lock:
+            stages = {}
+            for name, record in self._stages.items():
+                stage = {key: value for key, value in record.items() if key not in ("first_start", "last_end")}
+                if record["first_start"] is not None:
+                    stage["wall_seconds"] = record["last_end"] - record["first_start"]
+                    stage["offset_seconds"] = record["first_start"] - self._start
+                stages[name] = stage
+
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "total_seconds": time.perf_counter() - self._start,
+            "process_peak_rss_mb": peak_rss_mb(),
+            "stages": stages,
+            **self.extra,
+        }
+
+
+_current = RunMetrics()
+
+
+def start_run():
+    """Starts a fresh set of metrics (call once at the top of a run)."""
+    global _current
+    _current = RunMetrics()
+    return _current
+
+
+def current():
+    return _current
+
+
+def stage(name):
+    return _current.stage(name)
+
+
+def add(name, **counters):
+    _current.add(name, **counters)
+
+
+def emit(summary=None, db=None, collection=RUN_LOG_COLLECTION):
+    """
+    Logs the run summary as a single JSON line and, if a db and collection
+    are given, stores it as `{collection}/{run_id}`.
+    """
+    summary = summary or _current.summary()
+    logger.info(f"RUN_SUMMARY {json.dumps(summary, default=str, sort_keys=True)}")
+
+    if db is not None and collection:
+        try:
+            db.collection(collection).document(summary["run_id"]).set(summary)
+        except Exception as e:
+            logger.error(f"Failed to write run summary to Firestore: {e}")
+    return summary
@@ -4,6 +4,8 @@ Feature extraction, projection and hit-rate utilities.
 Avoids SettingWithCopyWarning by using .copy() and .loc[:, ...].
 """
 
+import zlib
+
 import pandas as pd
 import numpy as np
 
@@ -79,6 +81,125 @@ def calculate_recent_form(game_logs_df, last_n=10):
     }
 
 
+# -----------------------
+# BATCH (MULTI-PLAYER) FEATURES
+# -----------------------
+
+PLAYER_ID_COL = 'PLAYER_ID'
+_BATCH_COLS = ['FGA', 'FTA', 'TOV', 'MIN', 'PTS', 'AST', 'REB', 'FG3M', 'FG3_PCT']
+_SEASON_KEYS = [('PTS', 'PTS'), ('AST', 'AST'), ('REB', 'REB'), ('FG3M', 'FG3M'), ('MIN', 'MIN'),
+                ('USG_PCT', 'USG_APPROX'), ('FGA', 'FGA'), ('FTA', 'FTA'), ('TOV', 'TOV'), ('FG3_PCT', 'FG3_PCT')]
+_FORM_KEYS = [('PTS', 'PTS'), ('AST', 'AST'), ('REB', 'REB'), ('FG3M', 'FG3M'), ('MIN', 'MIN'), ('USG', 'USG_APPROX')]
+
+
+def _group_player_rows(game_logs_df, player_col):
+    """
+    Returns (players, order, starts, counts): the unique players in order of
+    first appearance, a stable row order that groups each player's games
+    together (keeping their original, most-recent-first order), and where
+    each player's block starts in that order and how long it is.
+    """
+    codes, players = pd.factorize(game_logs_df[player_col], sort=False)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(players))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+    # rows with a missing player id get code -1 and sort to the front; skip them
+    starts += int((codes < 0).sum())
+    return players, order, starts, counts
+
+
+def _coerce_numeric_columns(game_logs_df, cols, order):
+    """
+    Coerces each column once (missing -> 0, bad values -> 0) and returns
+    a (len(cols), n_rows) float array in `order`. Each column is a
+    contiguous row so per-player slices can be summed like pandas does.
+    """
+    values = np.zeros((len(cols), len(order)), dtype=np.float64)
+    for i, col in enumerate(cols):
+        if col in game_logs_df.columns:
+            series = game_logs_df[col]
+            if not pd.api.types.is_numeric_dtype(series):
+                series = pd.to_numeric(series, errors='coerce')
+            values[i] = series.to_numpy(dtype=np.float64, na_value=np.nan)[order]
+    np.nan_to_num(values, copy=False, nan=0.0, posinf=np.inf, neginf=-np.inf)
+    return values
+
+
+def _usg_approx(values, cols):
+    fga, fta, tov, mins = (values[cols.index(c)] for c in ('FGA', 'FTA', 'TOV', 'MIN'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        usg = (fga + 0.44 * fta + tov) / mins
+    usg[~np.isfinite(usg)] = 0.0
+    return usg
+
+
+def _segment_means(values, starts, lengths):
+    """
+    Mean of values[:, start:start + length] for every player.
+    Players with the same length are gathered into one (cols, players, length)
+    block and summed along the last axis, which gives bit-for-bit the same
+    result as Series.mean() on each player's own frame.
+    """
+    out = np.zeros((values.shape[0], len(starts)), dtype=np.float64)
+    for n in np.unique(lengths):
+        if n == 0:
+            continue
+        sel = np.flatnonzero(lengths == n)
+        idx = starts[sel, None] + np.arange(n)
+        # fancy indexing hands back an F-ordered block; make each
+        # player's slice contiguous so numpy sums it pairwise like pandas
+        block = np.ascontiguousarray(values[:, idx])
+        out[:, sel] = block.sum(axis=2) / n
+    return out
+
+
+def build_feature_table(game_logs_df, player_col=PLAYER_ID_COL, windows=(10, 5)):
+    """
+    Batch version of calculate_season_averages + calculate_recent_form.
+    Takes one long-format logs frame for every player (each player's games
+    most recent first, like the per-player functions expect), coerces the
+    columns once and returns one row of features per player, indexed by
+    player id. Values match the per-player dicts exactly.
+    """
+    columns = [key for key, _ in _SEASON_KEYS]
+    for n in windows:
+        columns += [f'{key}_L{n}' for key, _ in _FORM_KEYS]
+
+    if game_logs_df is None or game_logs_df.empty or player_col not in game_logs_df.columns:
+        return pd.DataFrame(columns=columns, dtype=np.float64)
+
+    players, order, starts, counts = _group_player_rows(game_logs_df, player_col)
+    values = _coerce_numeric_columns(game_logs_df, _BATCH_COLS, order)
+    values = np.vstack([values, _usg_approx(values, _BATCH_COLS)])
+    value_cols = _BATCH_COLS + ['USG_APPROX']
+
+    table = {}
+    season = _segment_means(values, starts, counts)
+    for key, col in _SEASON_KEYS:
+        table[key] = season[value_cols.index(col)]
+
+    for n in windows:
+        recent = _segment_means(values, starts, np.minimum(counts, n))
+        for key, col in _FORM_KEYS:
+            table[f'{key}_L{n}'] = recent[value_cols.index(col)]
+
+    return pd.DataFrame(table, index=pd.Index(players, name=player_col), columns=columns)
+
+
+def get_player_features(feature_table, player_id):
+    """
+    Looks up one player's row from build_feature_table as a plain dict,
+    in the same shape build_enhanced_feature_vector produces.
+    """
+    if feature_table is not None and player_id in feature_table.index:
+        return {key: float(value) for key, value in feature_table.loc[player_id].items()}
+
+    features = calculate_season_averages(None)
+    features.update(calculate_recent_form(None, last_n=10))
+    features.update(calculate_recent_form(None, last_n=5))
+    return features
+
+
 def get_opponent_context(team_stats_df, opponent_abbrev):
     if team_stats_df is None or team_stats_df.empty:
         return {'DEF_RATING': DEFAULT_DEF_RATING, 'PACE': DEFAULT_PACE, 'PTS_ALLOWED': DEFAULT_PTS_ALLOWED}
@@ -99,22 +220,96 @@ def get_opponent_context(team_stats_df, opponent_abbrev):
     return {'DEF_RATING': float(def_rating), 'PACE': float(pace), 'PTS_ALLOWED': float(pts_allowed)}
 
 
-def build_enhanced_feature_vector(player_game_logs, opponent_abbrev, team_abbrev, player_pos, dvp_data, head_to_head_games=None, team_stats_df=None):
-    features = {}
-    try:
-        features.update(calculate_season_averages(player_game_logs))
-        features.update(calculate_recent_form(player_game_logs, last_n=10))
-        features.update(calculate_recent_form(player_game_logs, last_n=5))
+DEFAULT_DVP_RANK = 15
+
+
+class TeamContextIndex:
+    """
+    Opponent context and DVP ranks resolved once per run.
+    Build it from the same team_stats_df / dvp_data you'd pass to
+    build_enhanced_feature_vector; lookups are then plain dict reads and
+    give the same values as get_opponent_context and the inline DVP lookup.
+    """
+
+    def __init__(self, team_stats_df=None, dvp_data=None):
+        self._context = {}
+        self._dvp = {}
+        self._build_context(team_stats_df)
+        self._build_dvp(dvp_data)
+
+    def _build_context(self, team_stats_df):
+        if team_stats_df is None or team_stats_df.empty:
+            return
+        if 'TEAM_ABBREVIATION' not in team_stats_df.columns and 'TEAM_ABBREV' not in team_stats_df.columns:
+            return
+
+        col_name = 'TEAM_ABBREVIATION' if 'TEAM_ABBREVIATION' in team_stats_df.columns else 'TEAM_ABBREV'
+        n = len(team_stats_df)
+        abbrevs = team_stats_df[col_name].values
+        def_ratings = team_stats_df['E_DEF_RATING'].values if 'E_DEF_RATING' in team_stats_df.columns else [DEFAULT_DEF_RATING] * n
+        paces = team_stats_df['E_PACE'].values if 'E_PACE' in team_stats_df.columns else [DEFAULT_PACE] * n
+
+        for abbrev, def_rating, pace in zip(abbrevs, def_ratings, paces):
+            # get_opponent_context uses the first matching row
+            if abbrev in self._context:
+                continue
+            pts_allowed = (def_rating * pace) / 100 if pace else DEFAULT_PTS_ALLOWED
+            self._context[abbrev] = {'DEF_RATING': float(def_rating), 'PACE': float(pace), 'PTS_ALLOWED': float(pts_allowed)}
+
+    def _build_dvp(self, dvp_data):
+        if not dvp_data:
+            return
+        for player_pos, teams in dvp_data.items():
+            try:
+                for abbrev, dvp in teams.items():
+                    try:
+                        self._dvp[(player_pos, abbrev)] = dvp.get('Rank', DEFAULT_DVP_RANK) if dvp else DEFAULT_DVP_RANK
+                    except Exception:
+                        self._dvp[(player_pos, abbrev)] = DEFAULT_DVP_RANK
+            except Exception:
+                continue
+
+    def opponent_context(self, opponent_abbrev):
+        context = self._context.get(opponent_abbrev)
+        if context is None:
+            return {'DEF_RATING': DEFAULT_DEF_RATING, 'PACE': DEFAULT_PACE, 'PTS_ALLOWED': DEFAULT_PTS_ALLOWED}
+        return dict(context)
+
+    def dvp_rank(self, player_pos, opponent_abbrev):
+        try:
+            return self._dvp.get((player_pos, opponent_abbrev), DEFAULT_DVP_RANK)
+        except TypeError:
+            # unhashable position/abbrev
+            return DEFAULT_DVP_RANK
 
-        opp_context = get_opponent_context(team_stats_df, opponent_abbrev)
-        features.update(opp_context)
 
-        # DVP rank if available
-        try:
-            dvp = dvp_data.get(player_pos, {}).get(opponent_abbrev, {}) if dvp_data else {}
-            features['DVP_RANK'] = dvp.get('Rank', 15) if dvp else 15
-        except Exception:
-            features['DVP_RANK'] = 15
+def build_enhanced_feature_vector(player_game_logs, opponent_abbrev, team_abbrev, player_pos, dvp_data, head_to_head_games=None, team_stats_df=None, player_features=None, team_context=None):
+    # player_features: this player's precomputed season/L10/L5 dict
+    # (e.g. from get_player_features) so the logs aren't scanned again.
+    # team_context: a TeamContextIndex built once per run, used instead of
+    # filtering team_stats_df / walking dvp_data for every player.
+    features = {}
+    try:
+        if player_features is not None:
+            features.update(player_features)
+        else:
+            features.update(calculate_season_averages(player_game_logs))
+            features.update(calculate_recent_form(player_game_logs, last_n=10))
+            features.update(calculate_recent_form(player_game_logs, last_n=5))
+
+        if team_context is not None:
+            features.update(team_context.opponent_context(opponent_abbrev))
+            features['DVP_RANK'] = team_context.dvp_rank(player_pos, opponent_abbrev)
+        else:
+            opp_context = get_opponent_context(team_stats_df, opponent_abbrev)
+            features.update(opp_context)
+
+            # DVP rank if available
+            try:
+                dvp = dvp_data.get(player_pos, {}).get(opponent_abbrev, {}) if dvp_data else {}
+                features['DVP_RANK'] = dvp.get('Rank', 15) if dvp else 15
+            except Exception:
+                features['DVP_RANK'] = 15
 
     except Exception as e:
         print(f"[model][ERROR] build_enhanced_feature_vector: {e}")
@@ -172,3 +367,272 @@ def calculate_hit_rates(game_logs_df, stat, book_line):
     except Exception as e:
         print(f"[model][ERROR] calculate_hit_rates: {e}")
         return {'L5': 0, 'L10': 0, 'Season': 0}
+
+
+# -----------------------
+# BATCH (WHOLE BOARD) SCORING
+# -----------------------
+
+_BOARD_STATS = ['pts', 'ast', 'reb', 'PRA']
+_BOARD_COLS = ['PTS', 'AST', 'REB']
+_PROJECTION_WEIGHTS = (0.6, 0.25, 0.15)  # L5, L10, season (same as predict_weighted_average)
+
+
+class PropBoardScorer:
+    """
+    Scores a whole board of (player, stat, line) props at once.
+    The per-player stat matrices and projections are built once from the
+    long-format logs; after that a line move only re-runs the comparison.
+    Hit rates and projections match calculate_hit_rates and
+    PlayerPropModel.predict for every row. PRA hit rates (which
+    calculate_hit_rates doesn't support) use PTS + REB + AST per game.
+    """
+
+    def __init__(self, game_logs_df, player_col=PLAYER_ID_COL, feature_table=None):
+        if feature_table is None:
+            feature_table = build_feature_table(game_logs_df, player_col)
+        self.feature_table = feature_table
+
+        if game_logs_df is None or game_logs_df.empty or player_col not in game_logs_df.columns:
+            self.players = pd.Index([])
+            self.counts = np.zeros(0, dtype=np.int64)
+            self.matrix = np.full((len(_BOARD_STATS), 0, 0), np.nan)
+            self.has_column = np.zeros(len(_BOARD_STATS), dtype=bool)
+        else:
+            players, order, starts, counts = _group_player_rows(game_logs_df, player_col)
+            values = _coerce_numeric_columns(game_logs_df, _BOARD_COLS, order)
+            pts, ast, reb = values
+            values = np.vstack([values, pts + reb + ast])
+
+            # (stat, player, game) with NaN padding; NaN > line is always False
+            max_games = int(counts.max()) if len(counts) else 0
+            game_idx = np.arange(max_games)
+            valid = game_idx[None, :] < counts[:, None]
+            rows = np.where(valid, starts[:, None] + game_idx[None, :], 0)
+            self.matrix = np.where(valid[None, :, :], values[:, rows], np.nan)
+
+            self.players = pd.Index(players)
+            self.counts = counts
+            present = [col in game_logs_df.columns for col in _BOARD_COLS]
+            self.has_column = np.array(present + [all(present)])
+
+        self.projections = self._build_projections()
+
+    def _build_projections(self):
+        """Weighted L5/L10/season projection per (stat, player)."""
+        w5, w10, w_season = _PROJECTION_WEIGHTS
+        proj = np.zeros((len(_BOARD_STATS), len(self.players)), dtype=np.float64)
+        if len(self.players):
+            table = self.feature_table.reindex(self.players).fillna(0.0)
+            for i, key in enumerate(['PTS', 'AST', 'REB']):
+                proj[i] = (w5 * table[f'{key}_L5'].to_numpy()
+                           + w10 * table[f'{key}_L10'].to_numpy()
+                           + w_season * table[key].to_numpy())
+            pts, ast, reb = proj[0], proj[1], proj[2]
+            proj[3] = pts + reb + ast
+        return proj
+
+    def score(self, players, stats, lines):
+        """
+        Scores parallel arrays of player ids, stat types and book lines.
+        Returns a DataFrame with one row per prop: L5, L10, Season hit
+        rates (ints, like calculate_hit_rates) and PROJECTION.
+        """
+        players = np.asarray(players)
+        stats = np.asarray(stats)
+        lines = np.asarray(lines, dtype=np.float64)
+
+        player_idx = self.players.get_indexer(players) if len(self.players) else np.full(len(players), -1)
+        stat_idx = pd.Index(_BOARD_STATS).get_indexer(stats)
+
+        known = (player_idx >= 0) & (stat_idx >= 0)
+        p = np.where(known, player_idx, 0)
+        s = np.where(known, stat_idx, 0)
+
+        projection = np.zeros(len(players), dtype=np.float64)
+        if len(self.players):
+            projection = np.where(known, self.projections[s, p], 0.0)
+
+        scorable = known & ~np.isnan(lines)
+        if len(self.players):
+            scorable &= self.has_column[s]
+        counts = np.where(scorable, self.counts[p] if len(self.players) else 0, 0)
+
+        result = {'player': players, 'stat': stats, 'line': lines}
+        if self.matrix.shape[2] == 0:
+            for key in ('L5', 'L10', 'Season'):
+                result[key] = np.zeros(len(players), dtype=np.int64)
+        else:
+            over = self.matrix[s, p] > lines[:, None]
+            hits = np.cumsum(over, axis=1)
+            for key, n in (('L5', 5), ('L10', 10), ('Season', None)):
+                window = counts if n is None else np.minimum(counts, n)
+                took = hits[np.arange(len(players)), np.maximum(window - 1, 0)]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rate = took / window * 100
+                result[key] = np.where(window > 0, rate, 0).astype(np.int64)
+
+        result['PROJECTION'] = projection
+        return pd.DataFrame(result)
+
+
+def score_prop_board(game_logs_df, players, stats, lines, player_col=PLAYER_ID_COL):
+    """One-shot helper: build a PropBoardScorer and score a board with it."""
+    return PropBoardScorer(game_logs_df, player_col).score(players, stats, lines)
+
+
+# -----------------------
+# DISTRIBUTIONAL (MONTE CARLO) PROJECTIONS
+# -----------------------
+
+SIM_DRAWS = 10000
+_SIM_CHUNK = 64  # players per simulated block (~10 MB of float32 draws at 10k draws)
+_COV_PRIOR_GAMES = 5  # how many games' worth of weight the prior covariance gets
+
+
+def _player_stream_key(player_id):
+    """A stable non-negative int per player id, to seed their random stream."""
+    if isinstance(player_id, (int, np.integer)) and player_id >= 0:
+        return int(player_id)
+    return zlib.crc32(str(player_id).encode("utf-8"))
+
+
+class PropSimulator(PropBoardScorer):
+    """
+    Distributional mode for a board: over/under probabilities at any line.
+    Each player's PTS/AST/REB are drawn from a multivariate normal (cut off
+    at 0) centred on the PlayerPropModel.predict projection, with the
+    covariance fitted from their game logs, so PRA keeps the correlation
+    between the three stats. The opponent's PACE scales every stat and
+    their DEF_RATING also scales points (both as ratios to the defaults).
+    The whole board is simulated in a few NumPy blocks. Every player's
+    draws come from their own stream seeded by (seed, player id), so a
+    player's probabilities only depend on their own props, the draws and
+    the seed, not on the rest of the board or its order.
+    """
+
+    def __init__(self, game_logs_df, player_col=PLAYER_ID_COL, feature_table=None):
+        super().__init__(game_logs_df, player_col, feature_table)
+        self.cholesky = self._fit_covariance()
+
+    def _fit_covariance(self):
+        """
+        Per-player Cholesky factor of the PTS/AST/REB covariance. The sample
+        covariance is shrunk toward a Poisson-like prior (variance = mean,
+        no correlation) so players with a handful of games still get a
+        sensible spread.
+        """
+        n_players = len(self.players)
+        if n_players == 0 or self.matrix.shape[2] == 0:
+            return np.zeros((n_players, 3, 3))
+
+        values = self.matrix[:3]
+        valid = ~np.isnan(values[0])
+        n = self.counts.astype(np.float64)
+        x = np.where(valid, values, 0.0)
+        mean = x.sum(axis=2) / np.maximum(n, 1)
+        centered = np.where(valid, x - mean[:, :, None], 0.0)
+        dof = np.maximum(n - 1, 0)
+        sample = np.einsum('ipg,jpg->pij', centered, centered) / np.maximum(dof, 1)[:, None, None]
+
+        diag = np.arange(3)
+        prior = np.zeros_like(sample)
+        prior[:, diag, diag] = np.maximum(mean.T, 0.0)
+        weight = (dof / (dof + _COV_PRIOR_GAMES))[:, None, None]
+        cov = weight * sample + (1 - weight) * prior
+        cov[:, diag, diag] += 1e-6  # keeps all-zero players positive definite
+        return np.linalg.cholesky(cov)
+
+    @staticmethod
+    def _opponent_factors(opponents, team_context):
+        """PTS/AST/REB multipliers against each opponent."""
+        factors = np.ones((len(opponents), 3))
+        if team_context is None:
+            return factors
+        for i, opponent in enumerate(opponents):
+            context = team_context.opponent_context(opponent)
+            pace = context['PACE'] / DEFAULT_PACE
+            defense = context['DEF_RATING'] / DEFAULT_DEF_RATING
+            pace = pace if np.isfinite(pace) and pace > 0 else 1.0
+            defense = defense if np.isfinite(defense) and defense > 0 else 1.0
+            factors[i] = (pace * defense, pace, pace)
+        return factors
+
+    def simulate(self, players, stats, lines, opponents=None, team_context=None, team_stats_df=None,
+                 draws=SIM_DRAWS, seed=0):
+        """
+        Scores parallel arrays of player ids, stat types and book lines
+        (plus, optionally, each prop's opponent abbreviation). Pass a
+        TeamContextIndex or team_stats_df for the opponent adjustment.
+        Returns a DataFrame with one row per prop: PROJECTION (after the
+        opponent adjustment), P_OVER and P_UNDER. Probabilities are NaN for
+        props that can't be scored (unknown player/stat, missing line).
+        """
+        players = np.asarray(players)
+        stats = np.asarray(stats)
+        lines = np.asarray(lines, dtype=np.float64)
+        if opponents is None:
+            opponents = [None] * len(players)
+        opponents = np.asarray(opponents, dtype=object)
+        if team_context is None and team_stats_df is not None:
+            team_context = TeamContextIndex(team_stats_df)
+
+        player_idx = self.players.get_indexer(players) if len(self.players) else np.full(len(players), -1)
+        stat_idx = pd.Index(_BOARD_STATS).get_indexer(stats)
+        known = (player_idx >= 0) & (stat_idx >= 0) & ~np.isnan(lines)
+        if len(self.players):
+            known &= self.has_column[np.where(stat_idx >= 0, stat_idx, 0)]
+
+        # One simulation unit per (player, opponent) pair on the board
+        opp_codes, opp_uniques = pd.factorize(pd.Series(opponents, dtype=object))
+        width = len(opp_uniques) + 1
+        unit_codes, unit_keys = pd.factorize(player_idx[known] * width + (opp_codes[known] + 1))
+        unit_players = unit_keys // width
+        # row 0 is "no opponent given"
+        factor_table = np.vstack([np.ones((1, 3)), self._opponent_factors(list(opp_uniques), team_context)])
+        factors = factor_table[unit_keys % width]
+
+        # x_j = f_j * (mu_j + (L z)_j): scaling row j of L scales the spread with the mean
+        unit_mean = self.projections[:3, unit_players].T * factors
+        mu = unit_mean.astype(np.float32)
+        chol = (self.cholesky[unit_players] * factors[:, :, None]).astype(np.float32)
+
+        projection = np.zeros(len(players), dtype=np.float64)
+        p_over = np.full(len(players), np.nan)
+        prop_unit = np.full(len(players), -1)
+        prop_unit[known] = unit_codes
+        pts, ast, reb = unit_mean.T
+        unit_proj = np.column_stack([unit_mean, pts + reb + ast])
+        projection[known] = unit_proj[unit_codes, stat_idx[known]]
+
+        # Each player gets their own stream, so their probabilities don't
+        # move when other props are added, removed or reordered
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        streams = [_player_stream_key(player_id) for player_id in self.players[unit_players]]
+        for start in range(0, len(unit_keys), _SIM_CHUNK):
+            end = min(start + _SIM_CHUNK, len(unit_keys))
+            z = np.stack([np.random.default_rng([seed, key]).standard_normal((3, draws), dtype=np.float32)
+                          for key in streams[start:end]])
+            sims = np.matmul(chol[start:end], z)
+            sims += mu[start:end, :, None]
+            np.maximum(sims, 0, out=sims)
+            # (unit, stat, draw) in _BOARD_STATS order: pts, ast, reb, PRA
+            sims = np.concatenate([sims, sims.sum(axis=1, keepdims=True)], axis=1)
+
+            sel = np.flatnonzero((prop_unit >= start) & (prop_unit < end))
+            drawn = sims[prop_unit[sel] - start, stat_idx[sel]]
+            over = np.count_nonzero(drawn > lines[sel, None].astype(np.float32), axis=1)
+            p_over[sel] = over / draws
+
+        return pd.DataFrame({
+            'player': players, 'stat': stats, 'line': lines,
+            'PROJECTION': projection, 'P_OVER': p_over, 'P_UNDER': 1.0 - p_over,
+        })
+
+
+def simulate_prop_board(game_logs_df, players, stats, lines, opponents=None, team_stats_df=None,
+                        draws=SIM_DRAWS, seed=0, player_col=PLAYER_ID_COL):
+    """One-shot helper: build a PropSimulator and simulate a board with it."""
+    return PropSimulator(game_logs_df, player_col).simulate(
+        players, stats, lines, opponents=opponents, team_stats_df=team_stats_df, draws=draws, seed=seed)
@@ -0,0 +1,179 @@
+"""
+api/parallel.py
+Multi-core slate evaluation.
+
+Runs build_enhanced_feature_vector, PlayerPropModel.predict and
+calculate_hit_rates for every player on a slate, with the players split
+into shards across a process pool. The logs are not pickled to the
+workers: the numeric columns model.py reads are packed once into a
+shared-memory float64 block (one contiguous row per column, each player's
+games together, most recent first), and each worker rebuilds a player's
+frame from slices of that block.
+
+Shards go back in submission order, so the result is the same for any
+number of workers, and workers=1 runs the exact same code in-process:
+
+    results = parallel.evaluate_slate(logs, slate, team_stats_df=team_stats, workers=8)
+"""
+
+import os
+import sys
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Allow running from the root folder
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+import model
+
+logger = logging.getLogger(__name__)
+
+# Columns the per-player model functions read; anything else stays behind
+SHARED_COLUMNS = ['FGA', 'FTA', 'TOV', 'MIN', 'PTS', 'AST', 'REB', 'FG3M', 'FG3_PCT']
+
+# Shards per worker: small enough to even out uneven players, big enough
+# that per-task overhead doesn't matter
+SHARDS_PER_WORKER = 4
+
+RESULT_COLUMNS = ['player', 'stat', 'line', 'PROJECTION', 'L5', 'L10', 'Season']
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+# --- Packing the logs ---
+
+def pack_logs(game_logs_df, player_col=model.PLAYER_ID_COL):
+    """
+    Returns (values, columns, players, starts, counts): a (len(columns),
+    n_rows) float64 array with every player's games next to each other
+    (keeping their original order), and where each player's block is.
+    Columns are coerced like the model functions do (bad values -> NaN).
+    """
+    columns = [col for col in SHARED_COLUMNS if col in game_logs_df.columns]
+    players, order, starts, counts = model._group_player_rows(game_logs_df, player_col)
+    values = np.empty((len(columns), len(order)), dtype=np.float64)
+    for i, col in enumerate(columns):
+        series = game_logs_df[col]
+        if not pd.api.types.is_numeric_dtype(series):
+            series = pd.to_numeric(series, errors='coerce')
+        values[i] = series.to_numpy(dtype=np.float64, na_value=np.nan)[order]
+    return values, columns, players, starts, counts
+
+
+def _attach(name):
+    """Attaches to the parent's block without taking over its cleanup."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block, but pool workers share
+        # the parent's resource tracker, so that's a no-op; the parent unlinks
+        return shared_memory.SharedMemory(name=name)
+
+
+# --- Worker side ---
+
+class _SlateContext:
+    """What every shard needs: the packed logs and the team context."""
+
+    def __init__(self, values, columns, team_stats_df, dvp_data):
+        self.values = values
+        self.columns = columns
+        self.dvp_data = dvp_data
+        self.team_context = model.TeamContextIndex(team_stats_df, dvp_data)
+        self.prop_model = model.PlayerPropModel()
+
+    def player_logs(self, start, count):
+        return pd.DataFrame({col: self.values[i, start:start + count] for i, col in enumerate(self.columns)})
+
+    def evaluate_shard(self, shard, stats):
+        rows = []
+        for entry, start, count in shard:
+            logs = self.player_logs(start, count)
+            features = model.build_enhanced_feature_vector(
+                logs, entry.get('opponent'), entry.get('team'), entry.get('position'), self.dvp_data,
+                team_context=self.team_context)
+            lines = entry.get('lines') or {}
+            for stat in stats:
+                line = lines.get(stat)
+                hit_rates = model.calculate_hit_rates(logs, stat, line)
+                rows.append((entry.get('player_id'), stat, line, self.prop_model.predict(features, stat),
+                             hit_rates['L5'], hit_rates['L10'], hit_rates['Season']))
+        return rows
+
+
+_worker = None
+_worker_shm = None
+
+
+def _init_worker(shm_name, shape, columns, team_stats_df, dvp_data):
+    global _worker, _worker_shm
+    _worker_shm = _attach(shm_name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    _worker = _SlateContext(values, columns, team_stats_df, dvp_data)
+
+
+def _run_shard(shard, stats):
+    return _worker.evaluate_shard(shard, stats)
+
+
+# --- Entry point ---
+
+def _shards(tasks, n_shards):
+    size = max(1, -(-len(tasks) // n_shards))
+    return [tasks[i:i + size] for i in range(0, len(tasks), size)]
+
+
+def evaluate_slate(game_logs_df, slate, stats=None, team_stats_df=None, dvp_data=None,
+                   workers=None, player_col=model.PLAYER_ID_COL):
+    """
+    Evaluates every player on the slate. Each slate entry is a dict with
+    player_id, opponent, team, position and lines ({stat: book line}).
+    game_logs_df is one long-format frame for every player (each player's
+    games most recent first). Returns a DataFrame with one row per
+    (player, stat) in slate order: PROJECTION from PlayerPropModel.predict
+    and L5/L10/Season from calculate_hit_rates.
+    """
+    stats = list(stats or model.PlayerPropModel.stat_types)
+    slate = list(slate)
+    workers = workers or default_workers()
+
+    if game_logs_df is None or game_logs_df.empty or player_col not in game_logs_df.columns:
+        values, columns = np.zeros((0, 0)), []
+        players, starts, counts = pd.Index([]), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    else:
+        values, columns, players, starts, counts = pack_logs(game_logs_df, player_col)
+
+    # (entry, start, count) per player; players without logs get an empty frame
+    lookup = pd.Index(players).get_indexer([entry.get('player_id') for entry in slate]) if len(players) \
+        else np.full(len(slate), -1)
+    tasks = [(entry, int(starts[i]) if i >= 0 else 0, int(counts[i]) if i >= 0 else 0)
+             for entry, i in zip(slate, lookup)]
+
+    if workers <= 1 or len(tasks) <= 1:
+        rows = _SlateContext(values, columns, team_stats_df, dvp_data).evaluate_shard(tasks, stats)
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        shared = np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)
+        shared[...] = values
+        shards = _shards(tasks, workers * SHARDS_PER_WORKER)
+        logger.info(f"Evaluating {len(tasks)} players in {len(shards)} shards on {workers} workers.")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, values.shape, columns, team_stats_df, dvp_data)) as pool:
+            # map() yields in submission order, which keeps the merge deterministic
+            rows = [row for shard_rows in pool.map(_run_shard, shards, [stats] * len(shards))
+                    for row in shard_rows]
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
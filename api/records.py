@@ -0,0 +1,163 @@
+"""
+api/records.py
+Compact, typed player stat lines.
+
+API-Basketball sends minutes as "34:12" strings and counts as whatever JSON
+type it likes, and every downstream step used to re-parse them. A
+PlayerStatLine parses everything once at ingestion (minutes -> float,
+counts -> int, missing -> 0) and uses __slots__ instead of a per-row dict.
+Lists of lines convert straight into a NumPy structured array (a few dozen
+bytes per row) or a DataFrame with small integer dtypes.
+
+numpy/pandas are imported inside the bulk converters, so importing this
+module stays cheap for the serverless entry point.
+"""
+
+# Box-score counts, in API field order
+COUNT_FIELDS = ("pts", "reb", "ast", "stl", "blk", "turnovers",
+                "fgm", "fga", "tpm", "tpa", "ftm", "fta")
+
+# Where each count comes from in the API's player statistics
+_API_FIELDS = {
+    "pts": "points",
+    "reb": "totReb",
+    "ast": "assists",
+    "stl": "steals",
+    "blk": "blocks",
+    "turnovers": "turnovers",
+    "fgm": "fgm",
+    "fga": "fga",
+    "tpm": "tpm",  # 3-pointers made
+    "tpa": "tpa",  # 3-pointers attempted
+    "ftm": "ftm",  # Free throws made
+    "fta": "fta",  # Free throws attempted
+}
+
+# Counts are stored as uint8 (the archive's Parquet schema too); no real
+# box-score count gets near this, so anything above it is clamped
+MAX_COUNT = 255
+
+# How record fields map onto the names model.py expects
+MODEL_COLUMNS = {
+    "player_id": "PLAYER_ID",
+    "game_id": "GAME_ID",
+    "game_date": "GAME_DATE",
+    "team_name": "TEAM_NAME",
+    "player_name": "PLAYER_NAME",
+    "min": "MIN",
+    "pts": "PTS",
+    "ast": "AST",
+    "reb": "REB",
+    "tpm": "FG3M",
+    "fga": "FGA",
+    "fta": "FTA",
+    "turnovers": "TOV",
+}
+
+
+def parse_minutes(value):
+    """API-Basketball sends minutes as "34:12" (or sometimes a number)."""
+    if isinstance(value, str) and ":" in value:
+        mins, _, secs = value.partition(":")
+        return parse_float(mins) + parse_float(secs) / 60
+    return parse_float(value)
+
+
+def parse_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    # NaN and inf both fail this check
+    return value if value - value == 0 else 0.0
+
+
+def parse_count(value):
+    """A count in 0..MAX_COUNT; "5", 5.0 and "5.0" all parse, bad values are 0."""
+    value = parse_float(value)
+    return min(int(value), MAX_COUNT) if value > 0 else 0
+
+
+def stat_line_dtype():
+    """NumPy structured dtype for the numeric part of a stat line."""
+    import numpy as np
+    return np.dtype([("game_id", np.int64), ("player_id", np.int64), ("min", np.float32)]
+                    + [(field, np.uint8) for field in COUNT_FIELDS])
+
+
+class PlayerStatLine:
+    __slots__ = ("player_id", "player_name", "team_name", "min") + COUNT_FIELDS
+
+    def __init__(self, player_id, player_name, team_name, min=0.0, **counts):
+        self.player_id = player_id
+        self.player_name = player_name
+        self.team_name = team_name
+        self.min = min
+        for field in COUNT_FIELDS:
+            setattr(self, field, counts.get(field, 0))
+
+    @classmethod
+    def from_api(cls, player_stat, team_name):
+        """Parses one entry of a `games/statistics` team's "statistics" list."""
+        player_info = player_stat.get("player") or {}
+        counts = {field: parse_count(player_stat.get(api_field)) for field, api_field in _API_FIELDS.items()}
+        return cls(
+            player_info.get("id"),
+            f"{player_info.get('firstname')} {player_info.get('lastname')}",
+            team_name,
+            parse_minutes(player_stat.get("min")),
+            **counts,
+        )
+
+    @classmethod
+    def from_dict(cls, stat_line):
+        """Parses an already-formatted stat dict (e.g. one read back from Firestore)."""
+        counts = {field: parse_count(stat_line.get(field)) for field in COUNT_FIELDS}
+        return cls(stat_line.get("player_id"), stat_line.get("player_name"), stat_line.get("team_name"),
+                   parse_minutes(stat_line.get("min")), **counts)
+
+    def to_dict(self):
+        """The dict shape we save to Firebase."""
+        data = {"player_id": self.player_id, "player_name": self.player_name,
+                "team_name": self.team_name, "min": self.min}
+        for field in COUNT_FIELDS:
+            data[field] = getattr(self, field)
+        return data
+
+    def numeric_tuple(self, game_id=0):
+        # Lines built directly (not through the parsers) may hold any int
+        return (game_id or 0, self.player_id or 0, self.min) + tuple(
+            min(max(getattr(self, field), 0), MAX_COUNT) for field in COUNT_FIELDS)
+
+    def __repr__(self):
+        return f"PlayerStatLine({self.player_id}, {self.player_name!r}, pts={self.pts}, min={self.min:.1f})"
+
+
+def to_structured_array(lines, game_id=0):
+    """Packs stat lines into one structured array (no per-row dicts)."""
+    import numpy as np
+    return np.fromiter((line.numeric_tuple(game_id) for line in lines), dtype=stat_line_dtype(), count=len(lines))
+
+
+def to_frame(lines, game_id=0, game_date=None, model_columns=False):
+    """
+    Stat lines as a DataFrame with compact dtypes (uint8 counts, float32
+    minutes). model_columns=True renames to the columns model.py reads
+    and adds FG3_PCT.
+    """
+    import numpy as np
+    import pandas as pd
+
+    packed = to_structured_array(lines, game_id)
+    df = pd.DataFrame({name: packed[name] for name in packed.dtype.names})
+    df.insert(2, "player_name", [line.player_name for line in lines])
+    df.insert(2, "team_name", [line.team_name for line in lines])
+    if game_date is not None:
+        df.insert(1, "game_date", game_date)
+
+    if model_columns:
+        tpm = df["tpm"].to_numpy(dtype=np.float64)
+        tpa = df["tpa"].to_numpy(dtype=np.float64)
+        df = df.rename(columns=MODEL_COLUMNS)
+        df["FG3_PCT"] = np.divide(tpm, tpa, out=np.zeros_like(tpm), where=tpa > 0)
+    return df
@@ -0,0 +1,152 @@
+"""
+api/response_cache.py
+A small on-disk cache for API-Basketball responses.
+Entries are keyed by endpoint + params, expire after a per-entry TTL
+(or never), and the least recently used files are evicted once the
+cache directory grows past its size limit.
+
+The cache only saves requests across runs if its directory survives
+between them. The GitHub Actions workflow restores API_CACHE_DIR with
+actions/cache. On Vercel, /tmp only lives as long as a warm instance, so
+there it mostly helps repeated invocations of the same instance; local
+runs and backfills keep it for good.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Vercel only lets us write to /tmp, so that's the default location
+DEFAULT_CACHE_DIR = os.environ.get(
+    "API_CACHE_DIR", os.path.join(tempfile.gettempdir(), "nba_api_cache")
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("API_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Pass this as the TTL for data that can never change (e.g. finished games)
+NEVER_EXPIRES = None
+
+
+class CacheEntry:
+    __slots__ = ("payload", "expires_at", "etag", "last_modified")
+
+    def __init__(self, payload, expires_at, etag=None, last_modified=None):
+        self.payload = payload
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self):
+        return self.expires_at is None or self.expires_at > time.time()
+
+
+class ResponseCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint, params):
+        raw = json.dumps({"endpoint": endpoint, "params": params or {}}, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, endpoint, params):
+        """
+        Returns the CacheEntry for this request (fresh or stale), or None.
+        Stale entries are still returned so the caller can do a
+        conditional refresh with their ETag / Last-Modified.
+        """
+        path = self._path(self.make_key(endpoint, params))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            # Bump the mtime so LRU eviction sees this entry as recently used
+            os.utime(path, None)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        return CacheEntry(
+            stored.get("payload"),
+            stored.get("expires_at"),
+            stored.get("etag"),
+            stored.get("last_modified"),
+        )
+
+    def set(self, endpoint, params, payload, ttl, etag=None, last_modified=None):
+        """Stores a payload. `ttl` is in seconds, or NEVER_EXPIRES."""
+        expires_at = None if ttl is NEVER_EXPIRES else time.time() + ttl
+        stored = {
+            "endpoint": endpoint,
+            "params": params,
+            "stored_at": time.time(),
+            "expires_at": expires_at,
+            "etag": etag,
+            "last_modified": last_modified,
+            "payload": payload,
+        }
+        path = self._path(self.make_key(endpoint, params))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temp file first so readers never see half an entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(stored, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry for {endpoint}: {e}")
+            return
+
+        self._evict_if_needed()
+
+    def refresh(self, endpoint, params, entry, ttl):
+        """Marks a stale entry as fresh again (after a 304 Not Modified)."""
+        self.set(endpoint, params, entry.payload, ttl, entry.etag, entry.last_modified)
+
+    def _evict_if_needed(self):
+        with self._lock:
+            try:
+                files = []
+                total = 0
+                for item in os.scandir(self.directory):
+                    if not item.name.endswith(".json"):
+                        continue
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+                    total += stat.st_size
+            except FileNotFoundError:
+                return
+
+            if total <= self.max_bytes:
+                return
+
+            # Oldest mtime = least recently used
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        try:
+            for item in os.scandir(self.directory):
+                if item.name.endswith(".json"):
+                    os.remove(item.path)
+        except FileNotFoundError:
+            pass
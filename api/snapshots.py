@@ -0,0 +1,188 @@
+"""
+api/snapshots.py
+Precomputed prop boards for the frontend.
+
+After ingest, every player on the day's slate goes through model.py: the
+season/L10/L5 features, the PlayerPropModel.predict projection and the
+L5/L10/season hit rates (PropBoardScorer gives the same numbers as the
+per-player functions for the whole board at once). Each stat's props are
+then stored pre-sorted by edge (see storage.save_prop_snapshots), so a
+page load is one small read instead of a full-day download plus math in
+the browser.
+
+Player logs come from the season's player_logs docs in Firestore, which
+get_data appends every finished game to (see storage.save_player_logs);
+a player is on the slate if the team of their latest logged game is
+playing today. Book lines come from PROP_LINES_PATH when it's set, as JSON
+{player_id: {stat: line}}. Only props with a book line have an edge and
+are ranked by it; the rest of the slate follows, by projection, with
+line/edge/side left empty and hit rates at the hook under the season
+average (hit_rate_line).
+"""
+
+import os
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+import backfill
+import helpers
+import model
+import storage
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_STATS = list(model.PlayerPropModel.stat_types)
+
+# Props kept per stat snapshot (the biggest edges first)
+SNAPSHOT_SIZE = int(os.environ.get("PROP_SNAPSHOT_SIZE", "100"))
+
+PROP_LINES_PATH = os.environ.get("PROP_LINES_PATH")
+
+# Feature-table columns summed for each stat's season average
+_SEASON_COLUMNS = {'pts': ['PTS'], 'ast': ['AST'], 'reb': ['REB'], 'PRA': ['PTS', 'REB', 'AST']}
+
+
+def slate_teams(games):
+    """{team_name: (team_code, opponent_code)} for every team playing."""
+    teams = {}
+    for game in games:
+        teams[game.get("home_team_name")] = (game.get("home"), game.get("away"))
+        teams[game.get("away_team_name")] = (game.get("away"), game.get("home"))
+    teams.pop(None, None)
+    return teams
+
+
+def load_slate_logs(db, games, date_str):
+    """
+    This season's logged games before date_str (model.py columns, most
+    recent first) for every player whose latest game was for a team on
+    the slate, including their games for other teams. Reads the roster
+    index plus one doc per team those players have played for.
+    """
+    teams = slate_teams(games)
+    team_logs = storage.load_player_logs(db, helpers.season_for_date(date_str), list(teams))
+
+    rows = []
+    for team_name, players in team_logs.items():
+        for player_id, player in players.items():
+            for game_id, (game_date, *values) in (player.get("games") or {}).items():
+                if game_date < date_str:
+                    rows.append([int(player_id), int(game_id) if game_id.isdigit() else game_id,
+                                 game_date, team_name, player.get("name"), *values])
+    logs = backfill.to_model_logs(pd.DataFrame(
+        rows, columns=["player_id", "game_id", "game_date", "team_name", "player_name",
+                       *storage.PLAYER_LOG_FIELDS]))
+    if logs.empty:
+        return logs
+
+    # Players traded away since their last game for a slate team play for
+    # someone else now
+    current_team = logs.drop_duplicates(model.PLAYER_ID_COL).set_index(model.PLAYER_ID_COL)["TEAM_NAME"]
+    on_slate = current_team[current_team.isin(list(teams))].index
+    return logs[logs[model.PLAYER_ID_COL].isin(on_slate)].reset_index(drop=True)
+
+
+def load_prop_lines(path=None):
+    """{player_id(str): {stat: line}} from a JSON file, or {} if there isn't one."""
+    path = path or PROP_LINES_PATH
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {str(player_id): lines for player_id, lines in json.load(f).items()}
+
+
+def _round(value):
+    return round(float(value), 2)
+
+
+def slate_feature_table(logs, store=None):
+    """
+    model.build_feature_table for the slate's logs, except that players
+    the feature store is in sync with (same season, same number of games,
+    same latest game) are read from the store instead of recomputed. The
+    others are reseeded in the store from their logs, so it catches up
+    (save it afterwards to keep that).
+    """
+    if store is None or logs.empty:
+        return model.build_feature_table(logs)
+
+    by_player = logs.groupby(model.PLAYER_ID_COL, sort=False)["GAME_DATE"]
+    counts, latest = by_player.size(), by_player.max()
+    in_sync = [player_id for player_id in counts.index
+               if store.in_sync(player_id, helpers.season_for_date(latest[player_id]),
+                                int(counts[player_id]), latest[player_id])]
+    stale = logs[~logs[model.PLAYER_ID_COL].isin(in_sync)]
+    logger.info(f"Feature store: {len(in_sync)} players read, {stale[model.PLAYER_ID_COL].nunique()} recomputed.")
+
+    table = model.build_feature_table(stale)
+    store.reseed(stale)
+    if in_sync:
+        table = pd.concat([store.feature_table(in_sync)[table.columns], table])
+    return table
+
+
+def build_snapshots(logs, games, prop_lines=None, size=SNAPSHOT_SIZE, feature_store=None):
+    """
+    Scores every slate player's props and returns {stat: rows}. Props with
+    a book line come first, sorted by |edge| (projection - line), biggest
+    first; players without one follow by projection and have no edge.
+    """
+    prop_lines = prop_lines or {}
+    if logs is None or logs.empty:
+        return {stat: [] for stat in SNAPSHOT_STATS}
+
+    teams = slate_teams(games)
+    table = slate_feature_table(logs, feature_store)
+    scorer = model.PropBoardScorer(logs, feature_table=table)
+    latest = logs.drop_duplicates(model.PLAYER_ID_COL).set_index(model.PLAYER_ID_COL)
+    player_ids = list(table.index)
+
+    snapshots = {}
+    for stat in SNAPSHOT_STATS:
+        season_avg = table[_SEASON_COLUMNS[stat]].sum(axis=1).to_numpy()
+        book = [prop_lines.get(str(player_id), {}).get(stat) for player_id in player_ids]
+        lines = np.array([np.nan if line is None else line for line in book], dtype=np.float64)
+        from_book = ~np.isnan(lines)
+        # Without a book line, hit rates are at the hook under the season average
+        lines = np.where(from_book, lines, np.floor(season_avg) + 0.5)
+
+        board = scorer.score(player_ids, [stat] * len(player_ids), lines)
+        board["from_book"] = from_book
+        board["edge"] = np.where(from_book, board["PROJECTION"] - board["line"], np.nan)
+        board["order"] = np.where(from_book, -board["edge"].abs(), -board["PROJECTION"])
+        board = board.sort_values(["from_book", "order", "player"], ascending=[False, True, True],
+                                  kind="stable").head(size)
+
+        rows = []
+        for prop in board.itertuples(index=False):
+            player = latest.loc[prop.player]
+            team_code, opponent = teams.get(player["TEAM_NAME"], (None, None))
+            rows.append({
+                "player_id": int(prop.player),
+                "player_name": player["PLAYER_NAME"],
+                "team": team_code,
+                "opponent": opponent,
+                "line": _round(prop.line) if prop.from_book else None,
+                "projection": _round(prop.PROJECTION),
+                "edge": _round(prop.edge) if prop.from_book else None,
+                "side": ("over" if prop.edge > 0 else "under") if prop.from_book else None,
+                "hit_rate_line": _round(prop.line),
+                "l5": int(prop.L5),
+                "l10": int(prop.L10),
+                "season": int(prop.Season),
+            })
+        snapshots[stat] = rows
+    return snapshots
+
+
+def build_slate_snapshots(db, games, date_str, prop_lines=None, feature_store=None):
+    """Loads the slate's player logs from Firestore and builds every stat's snapshot."""
+    logs = load_slate_logs(db, games, date_str)
+    logger.info(f"Building prop snapshots for {logs[model.PLAYER_ID_COL].nunique() if len(logs) else 0} "
+                f"players ({len(logs)} logged games).")
+    if prop_lines is None:
+        prop_lines = load_prop_lines()
+    return build_snapshots(logs, games, prop_lines, feature_store=feature_store)
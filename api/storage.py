@@ -0,0 +1,280 @@
+"""
+api/storage.py
+Firestore layout for the daily slate.
+
+  nba_games/{date}                    small index doc: one summary per game
+                                      (no player stats) + a content hash
+  nba_games/{date}/games/{game_id}    one doc per game, with its player stats
+
+  prop_snapshots/{date}               small index doc: {stat: {version, count}}
+  prop_snapshots/{date}/stats/{stat}  one pre-sorted prop board per stat
+
+  player_logs/{season}                roster index: {player_id: {team: true}}
+                                      for every team a player has played for
+  player_logs/{season}/teams/{team}   every player's game lines for one team
+                                      this season, keyed by game id (the
+                                      history the prop snapshots are built from)
+
+Writes are upserts done through batched writes, and a game (or snapshot)
+is only rewritten when its content hash changed, so re-runs cost nothing
+for data we already saved.
+"""
+
+import json
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+GAMES_COLLECTION = "nba_games"
+GAME_SUBCOLLECTION = "games"
+SNAPSHOTS_COLLECTION = "prop_snapshots"
+SNAPSHOT_SUBCOLLECTION = "stats"
+PLAYER_LOGS_COLLECTION = "player_logs"
+TEAM_LOG_SUBCOLLECTION = "teams"
+
+# Per-game values kept in the player logs, stored after the game date
+PLAYER_LOG_FIELDS = ("min", "pts", "reb", "ast", "turnovers", "fga", "fta", "tpm", "tpa")
+
+# Firestore allows 500 writes per batch; keep some headroom
+MAX_BATCH_WRITES = 450
+
+
+def content_hash(data):
+    """Stable hash of a game dict, used to skip unchanged writes."""
+    raw = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _game_summary(game, stats_hash):
+    summary = {key: value for key, value in game.items() if key != "player_stats"}
+    summary["player_count"] = len(game.get("player_stats") or [])
+    summary["content_hash"] = stats_hash
+    return summary
+
+
+def index_ref(db, date_str):
+    return db.collection(GAMES_COLLECTION).document(date_str)
+
+
+def game_ref(db, date_str, game_id):
+    return index_ref(db, date_str).collection(GAME_SUBCOLLECTION).document(str(game_id))
+
+
+def load_index(db, date_str):
+    """Returns {game_id(str): summary} from the day's index doc (empty if none)."""
+    snapshot = index_ref(db, date_str).get()
+    if not snapshot.exists:
+        return {}
+    data = snapshot.to_dict() or {}
+    return {str(summary.get("game_id")): summary for summary in data.get("games", [])}
+
+
+class _BatchWriter:
+    """Collects writes and commits them in Firestore-sized batches."""
+
+    def __init__(self, db):
+        self.db = db
+        self.batch = db.batch()
+        self.pending = 0
+        self.committed = 0
+
+    def set(self, ref, data, merge=False):
+        self.batch.set(ref, data, merge=merge)
+        self.pending += 1
+        if self.pending >= MAX_BATCH_WRITES:
+            self.commit()
+
+    def commit(self):
+        if self.pending:
+            self.batch.commit()
+            self.committed += self.pending
+            self.batch = self.db.batch()
+            self.pending = 0
+
+
+def save_slate(db, date_str, games, existing_index=None):
+    """
+    Upserts the given games for a date and refreshes the index doc.
+    Games already in the index but not passed in are kept as they are.
+    Pass existing_index (from load_index) if you already read it.
+    Returns {"written": [...game_ids], "unchanged": [...game_ids]}.
+    """
+    # Imported here so loading this module doesn't pull in firebase_admin
+    from firebase_admin import firestore
+
+    if existing_index is None:
+        existing_index = load_index(db, date_str)
+
+    index = dict(existing_index)
+    writer = _BatchWriter(db)
+    written, unchanged = [], []
+
+    for game in games:
+        game_id = str(game["game_id"])
+        new_hash = content_hash(game)
+
+        if existing_index.get(game_id, {}).get("content_hash") == new_hash:
+            unchanged.append(game["game_id"])
+            continue
+
+        doc = dict(game)
+        doc["content_hash"] = new_hash
+        doc["last_updated"] = firestore.SERVER_TIMESTAMP
+        writer.set(game_ref(db, date_str, game_id), doc)
+
+        index[game_id] = _game_summary(game, new_hash)
+        written.append(game["game_id"])
+
+    if written:
+        writer.set(index_ref(db, date_str), {
+            "games": list(index.values()),
+            "game_ids": [summary.get("game_id") for summary in index.values()],
+            "last_updated": firestore.SERVER_TIMESTAMP,
+        })
+    writer.commit()
+
+    logger.info(f"Saved {len(written)} games to {GAMES_COLLECTION}/{date_str} "
+                f"({len(unchanged)} unchanged, {writer.committed} writes).")
+    return {"written": written, "unchanged": unchanged}
+
+
+# --- Prop snapshots ---
+
+def snapshot_index_ref(db, date_str):
+    return db.collection(SNAPSHOTS_COLLECTION).document(date_str)
+
+
+def snapshot_ref(db, date_str, stat):
+    return snapshot_index_ref(db, date_str).collection(SNAPSHOT_SUBCOLLECTION).document(stat)
+
+
+def load_snapshot_versions(db, date_str):
+    """Returns {stat: {"version", "count"}} from the day's snapshot index (empty if none)."""
+    snapshot = snapshot_index_ref(db, date_str).get()
+    if not snapshot.exists:
+        return {}
+    return (snapshot.to_dict() or {}).get("stats", {})
+
+
+def save_prop_snapshots(db, date_str, snapshots):
+    """
+    Upserts one doc per stat from {stat: [rows]} and refreshes the index
+    doc of versions. A snapshot's version is the hash of its rows, so
+    clients can compare versions and only re-read stats that changed;
+    unchanged snapshots aren't rewritten either.
+    Returns {"written": [...stats], "unchanged": [...stats]}.
+    """
+    from firebase_admin import firestore
+
+    existing = load_snapshot_versions(db, date_str)
+    versions = dict(existing)
+    writer = _BatchWriter(db)
+    written, unchanged = [], []
+
+    for stat, rows in snapshots.items():
+        version = content_hash(rows)[:12]
+        if existing.get(stat, {}).get("version") == version:
+            unchanged.append(stat)
+            continue
+
+        writer.set(snapshot_ref(db, date_str, stat), {
+            "date": date_str,
+            "stat": stat,
+            "version": version,
+            "rows": rows,
+            "last_updated": firestore.SERVER_TIMESTAMP,
+        })
+        versions[stat] = {"version": version, "count": len(rows)}
+        written.append(stat)
+
+    if written:
+        writer.set(snapshot_index_ref(db, date_str), {
+            "date": date_str,
+            "stats": versions,
+            "last_updated": firestore.SERVER_TIMESTAMP,
+        })
+    writer.commit()
+
+    logger.info(f"Saved {len(written)} prop snapshots to {SNAPSHOTS_COLLECTION}/{date_str} "
+                f"({len(unchanged)} unchanged).")
+    return {"written": written, "unchanged": unchanged}
+
+
+# --- Player logs ---
+
+def player_logs_ref(db, season):
+    return db.collection(PLAYER_LOGS_COLLECTION).document(season)
+
+
+def team_log_ref(db, season, team_name):
+    return player_logs_ref(db, season).collection(TEAM_LOG_SUBCOLLECTION).document(team_name.replace("/", "-"))
+
+
+def save_player_logs(db, season, games):
+    """
+    Appends games' player stat lines to the season's per-team log docs and
+    notes each player's team in the roster index. Each game is one merge
+    write per team (plus one to the index), with the lines keyed by player
+    and game id, so saving the same game again is harmless.
+    Only pass finished games. Returns the number of writes.
+    """
+    from firebase_admin import firestore
+
+    writer = _BatchWriter(db)
+    rosters = {}
+    for game in games:
+        by_team = {}
+        for line in game.get("player_stats") or []:
+            if line.get("player_id") is None or not line.get("team_name"):
+                continue
+            player_id = str(line["player_id"])
+            row = [game.get("game_date")] + [line.get(field) or 0 for field in PLAYER_LOG_FIELDS]
+            by_team.setdefault(line["team_name"], {})[player_id] = {
+                "name": line.get("player_name"),
+                "games": {str(game["game_id"]): row},
+            }
+            rosters.setdefault(player_id, {})[line["team_name"]] = True
+        for team_name, players in by_team.items():
+            writer.set(team_log_ref(db, season, team_name), {
+                "season": season,
+                "team_name": team_name,
+                "players": players,
+                "last_updated": firestore.SERVER_TIMESTAMP,
+            }, merge=True)
+
+    if rosters:
+        writer.set(player_logs_ref(db, season), {
+            "season": season,
+            "rosters": rosters,
+            "last_updated": firestore.SERVER_TIMESTAMP,
+        }, merge=True)
+    writer.commit()
+
+    logger.info(f"Appended {len(games)} games to {PLAYER_LOGS_COLLECTION}/{season} ({writer.committed} writes).")
+    return writer.committed
+
+
+def load_player_logs(db, season, team_names):
+    """
+    Every game this season of each player who has played for one of
+    team_names, including their games for other teams (so a traded
+    player's full history comes back, and whoever traded them away can
+    tell). Returns {team_name: {player_id(str): {"name", "games"}}}.
+    """
+    index = player_logs_ref(db, season).get()
+    rosters = (index.to_dict() or {}).get("rosters", {}) if index.exists else {}
+    wanted = set(team_names)
+    players = {player_id for player_id, teams in rosters.items() if wanted & set(teams)}
+    teams_to_read = wanted.union(*(rosters[player_id] for player_id in players))
+
+    logs = {}
+    for team_name in sorted(teams_to_read):
+        snapshot = team_log_ref(db, season, team_name).get()
+        if not snapshot.exists:
+            continue
+        team_players = (snapshot.to_dict() or {}).get("players", {})
+        if team_name not in wanted:
+            team_players = {player_id: log for player_id, log in team_players.items() if player_id in players}
+        logs[team_name] = team_players
+    return logs
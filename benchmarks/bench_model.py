@@ -0,0 +1,265 @@
+"""
+benchmarks/bench_model.py
+Benchmarks for the api/model.py feature and scoring hot paths.
+
+Generates synthetic season logs at slate scale (450 players x 82 games,
+or several seasons with --seasons), then times the per-player functions
+across a whole board and the batch versions that replace them.
+For every benchmark it reports throughput, p50/p99 per-call latency and
+peak Python memory, and writes everything to a JSON file so two commits
+can be compared:
+
+    python benchmarks/bench_model.py --output bench_before.json
+    (make changes)
+    python benchmarks/bench_model.py --output bench_after.json --compare bench_before.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+import subprocess
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'api')))
+
+import model
+import parallel
+
+STAT_COLUMNS = {'pts': 'PTS', 'ast': 'AST', 'reb': 'REB'}
+BOARD_STATS = ['pts', 'ast', 'reb', 'PRA']
+
+
+# --- Synthetic data ---
+
+def make_logs(players=450, games=82, seasons=1, seed=0):
+    """
+    Long-format logs for `players` players with games*seasons rows each,
+    most recent game first, in the columns model.py reads.
+    """
+    rng = np.random.default_rng(seed)
+    n_games = games * seasons
+    n = players * n_games
+
+    # Each player gets their own scoring/rebounding/assist profile
+    minutes_mean = rng.uniform(12, 38, players)
+    pts_rate = rng.uniform(0.3, 0.95, players)
+    reb_rate = rng.uniform(0.1, 0.4, players)
+    ast_rate = rng.uniform(0.05, 0.35, players)
+
+    player_idx = np.repeat(np.arange(players), n_games)
+    mins = np.clip(rng.normal(minutes_mean[player_idx], 5), 0, 48)
+    fga = rng.poisson(mins * pts_rate[player_idx] * 0.45)
+    fta = rng.poisson(mins * pts_rate[player_idx] * 0.12)
+    fg3m = rng.binomial(fga, 0.15)
+
+    start = pd.Timestamp("2025-10-21")
+    game_dates = start + pd.to_timedelta(np.tile(np.arange(n_games)[::-1] * 2, players), unit="D")
+
+    return pd.DataFrame({
+        'PLAYER_ID': player_idx + 1,
+        'GAME_ID': np.tile(np.arange(n_games)[::-1], players),
+        'GAME_DATE': game_dates.strftime("%Y-%m-%d"),
+        'MIN': mins.round(1),
+        'PTS': rng.poisson(mins * pts_rate[player_idx]),
+        'REB': rng.poisson(mins * reb_rate[player_idx]),
+        'AST': rng.poisson(mins * ast_rate[player_idx]),
+        'FG3M': fg3m,
+        'FGA': fga,
+        'FTA': fta,
+        'TOV': rng.poisson(mins * 0.05),
+        'FG3_PCT': np.where(fga > 0, fg3m / np.maximum(fga, 1), 0.0).round(3),
+    })
+
+
+def make_board(logs, seed=0):
+    """One prop per player per stat, with lines near each player's average."""
+    rng = np.random.default_rng(seed)
+    means = logs.groupby('PLAYER_ID')[['PTS', 'AST', 'REB']].mean()
+    players, stats, lines = [], [], []
+    for player_id, row in means.iterrows():
+        for stat in BOARD_STATS:
+            mean = row['PTS'] + row['AST'] + row['REB'] if stat == 'PRA' else row[STAT_COLUMNS[stat]]
+            players.append(player_id)
+            stats.append(stat)
+            lines.append(np.floor(mean + rng.normal(0, 1.5)) + 0.5)
+    return np.array(players), np.array(stats), np.array(lines)
+
+
+# --- Timing ---
+
+def _measure(name, calls, repeat):
+    """
+    Runs every callable in `calls` `repeat` times, timing each call.
+    Peak memory is taken from one extra pass under tracemalloc so the
+    tracing overhead doesn't leak into the latencies.
+    """
+    latencies = []
+    total_start = time.perf_counter()
+    for _ in range(repeat):
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+    total = time.perf_counter() - total_start
+
+    tracemalloc.start()
+    for call in calls:
+        call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    return {
+        'name': name,
+        'calls': int(len(latencies)),
+        'total_seconds': total,
+        'throughput_per_second': len(latencies) / total if total else float('inf'),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'peak_memory_mb': peak / (1024 * 1024),
+    }
+
+
+def run_benchmarks(logs, repeat=1):
+    players, stats, lines = make_board(logs)
+    per_player = {player_id: frame for player_id, frame in logs.groupby('PLAYER_ID', sort=False)}
+    prop_model = model.PlayerPropModel()
+
+    # Features are needed for predict(); build them once outside the timed loop
+    features = {
+        player_id: model.build_enhanced_feature_vector(frame, 'BOS', 'LAL', 'G', None)
+        for player_id, frame in per_player.items()
+    }
+
+    results = []
+    results.append(_measure('calculate_season_averages', [
+        (lambda f=frame: model.calculate_season_averages(f)) for frame in per_player.values()
+    ], repeat))
+    results.append(_measure('calculate_recent_form', [
+        (lambda f=frame: model.calculate_recent_form(f, last_n=10)) for frame in per_player.values()
+    ], repeat))
+    results.append(_measure('build_enhanced_feature_vector', [
+        (lambda f=frame: model.build_enhanced_feature_vector(f, 'BOS', 'LAL', 'G', None)) for frame in per_player.values()
+    ], repeat))
+    results.append(_measure('calculate_hit_rates', [
+        (lambda p=p, s=s, l=l: model.calculate_hit_rates(per_player[p], s, l))
+        for p, s, l in zip(players, stats, lines) if s != 'PRA'
+    ], repeat))
+    results.append(_measure('PlayerPropModel.predict', [
+        (lambda p=p, s=s: prop_model.predict(features[p], s)) for p, s in zip(players, stats)
+    ], repeat))
+
+    # Batch replacements, one call per whole board
+    results.append(_measure('build_feature_table (batch)', [
+        lambda: model.build_feature_table(logs)
+    ], repeat))
+    scorer = model.PropBoardScorer(logs)
+    results.append(_measure('PropBoardScorer init (batch)', [
+        lambda: model.PropBoardScorer(logs)
+    ], repeat))
+    results.append(_measure('PropBoardScorer.score (batch)', [
+        lambda: scorer.score(players, stats, lines)
+    ], repeat))
+
+    # Distributional mode: the whole board at model.SIM_DRAWS draws per player
+    simulator = model.PropSimulator(logs)
+    results.append(_measure('PropSimulator.simulate (batch)', [
+        lambda: simulator.simulate(players, stats, lines)
+    ], repeat))
+
+    # Per-player path sharded across processes; compare against 1 worker
+    slate = [{'player_id': player_id, 'opponent': 'BOS', 'team': 'LAL', 'position': 'G',
+              'lines': {s: l for p, s, l in zip(players, stats, lines) if p == player_id}}
+             for player_id in per_player]
+    for workers in sorted({1, parallel.default_workers()}):
+        results.append(_measure(f'evaluate_slate ({workers} workers)', [
+            lambda w=workers: parallel.evaluate_slate(logs, slate, workers=w)
+        ], repeat))
+    return results
+
+
+# --- Reporting ---
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_report(results, baseline=None):
+    base = {row['name']: row for row in (baseline or {}).get('results', [])}
+    header = f"{'benchmark':34} {'calls':>7} {'calls/s':>11} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>9}"
+    if base:
+        header += f" {'vs base':>8}"
+    print(header)
+    for row in results:
+        line = (f"{row['name']:34} {row['calls']:>7} {row['throughput_per_second']:>11.1f} "
+                f"{row['p50_ms']:>9.3f} {row['p99_ms']:>9.3f} {row['peak_memory_mb']:>9.2f}")
+        if row['name'] in base:
+            # >1.00x means faster than the baseline
+            ratio = row['throughput_per_second'] / base[row['name']]['throughput_per_second']
+            line += f" {ratio:>7.2f}x"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model.py hot paths on synthetic slates.")
+    parser.add_argument('--players', type=int, default=450)
+    parser.add_argument('--games', type=int, default=82, help="games per season")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 3],
+                        help="season counts to run (default: 1 and 3)")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter('ignore')
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'runs': [],
+    }
+
+    for seasons in args.seasons:
+        logs = make_logs(args.players, args.games, seasons, args.seed)
+        print(f"\n== {args.players} players x {args.games * seasons} games ({len(logs)} rows) ==")
+        results = run_benchmarks(logs, args.repeat)
+
+        base_run = None
+        if baseline:
+            base_run = next((run for run in baseline.get('runs', []) if run.get('seasons') == seasons), None)
+        print_report(results, base_run)
+
+        report['runs'].append({
+            'players': args.players,
+            'games_per_season': args.games,
+            'seasons': seasons,
+            'rows': len(logs),
+            'results': results,
+        })
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+benchmarks/cold_start.py
+Measures what a serverless cold start pays before api/get_data.py does
+any work: the time to import it in a fresh interpreter, and which
+modules that time goes to (via `python -X importtime`).
+
+    python benchmarks/cold_start.py --runs 10
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+IMPORT_SNIPPET = (
+    "import time, json; t = time.perf_counter(); import get_data; "
+    "print(json.dumps({'import_seconds': time.perf_counter() - t, "
+    "'heavy_modules': sorted(m for m in ('pandas', 'numpy', 'firebase_admin', 'google.cloud.firestore', 'dotenv') "
+    "if m in __import__('sys').modules)}))"
+)
+
+
+def measure_import(runs):
+    timings, heavy = [], None
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=API_DIR,
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        timings.append(result["import_seconds"])
+        heavy = result["heavy_modules"]
+    return timings, heavy
+
+
+def top_imports(limit):
+    """Slowest modules by cumulative import time, from -X importtime."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import get_data"], cwd=API_DIR,
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure get_data cold-start import cost.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    timings, heavy = measure_import(args.runs)
+    slowest = top_imports(args.top)
+
+    print(f"import get_data over {args.runs} fresh interpreters:")
+    print(f"  median {statistics.median(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms")
+    print(f"  heavy modules loaded at import: {', '.join(heavy) or 'none'}")
+    print("\nslowest imports (cumulative):")
+    for us, name in slowest:
+        print(f"  {us / 1000:>8.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"import_seconds": timings, "heavy_modules": heavy,
+                       "slowest": [{"module": name, "cumulative_ms": us / 1000} for us, name in slowest]},
+                      f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+benchmarks/replay.py
+Offline replay harness for the get_data pipeline.
+
+Serves recorded (or synthetic) `games` and `games/statistics` responses
+from a local HTTP server that can inject latency, server errors and 429s,
+and runs get_data.main against it with an in-memory Firestore stand-in.
+The slate can be multiplied (1x, 10x, 100x...) to see how wall time
+scales against the 60s Vercel maxDuration.
+
+    # record today's real responses once (needs RAPIDAPI_KEY)
+    python benchmarks/replay.py record --fixtures benchmarks/fixtures/2026-01-15 --date 2026-01-15
+
+    # replay them (or omit --fixtures to use a synthetic 12-game slate)
+    python benchmarks/replay.py run --scales 1 10 100 --latency-ms 300 --error-rate 0.02 --rate-limit-rate 0.02
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'api'))
+sys.path.append(API_DIR)
+
+# Scaled copies of a game get ids base_id + copy * ID_STRIDE
+ID_STRIDE = 10_000_000
+MAX_DURATION_SECONDS = 60
+
+
+# --- Fixtures ---
+
+def synthetic_fixtures(games=12, players_per_team=13, seed=0):
+    """A fake slate in the shape API-Basketball returns."""
+    rng = random.Random(seed)
+    teams = [("BOS", "Boston Celtics"), ("LAL", "Los Angeles Lakers"), ("MIA", "Miami Heat"),
+             ("DEN", "Denver Nuggets"), ("GSW", "Golden State Warriors"), ("NYK", "New York Knicks")]
+    scoreboard, statistics = [], {}
+    for i in range(games):
+        game_id = 400000 + i
+        home, away = rng.sample(teams, 2)
+        scoreboard.append({
+            "id": game_id,
+            "status": {"short": "FT"},
+            "teams": {"home": {"code": home[0], "name": home[1]}, "visitors": {"code": away[0], "name": away[1]}},
+            "scores": {"home": {"total": rng.randint(90, 130)}, "visitors": {"total": rng.randint(90, 130)}},
+        })
+        statistics[str(game_id)] = [
+            {"team": {"name": name}, "statistics": [
+                {
+                    "player": {"id": game_id * 100 + side * 50 + p, "firstname": "Player", "lastname": f"{p}"},
+                    "min": f"{rng.randint(5, 40)}:{rng.randint(0, 59):02d}",
+                    "points": rng.randint(0, 35), "totReb": rng.randint(0, 12), "assists": rng.randint(0, 10),
+                    "steals": rng.randint(0, 3), "blocks": rng.randint(0, 3), "turnovers": rng.randint(0, 5),
+                    "fgm": rng.randint(0, 12), "fga": rng.randint(0, 22), "tpm": rng.randint(0, 5),
+                    "tpa": rng.randint(0, 10), "ftm": rng.randint(0, 8), "fta": rng.randint(0, 10),
+                }
+                for p in range(players_per_team)
+            ]}
+            for side, (_, name) in enumerate((home, away))
+        ]
+    return scoreboard, statistics
+
+
+def load_fixtures(directory):
+    with open(os.path.join(directory, "games.json"), "r", encoding="utf-8") as f:
+        scoreboard = json.load(f)["response"]
+    statistics = {}
+    stats_dir = os.path.join(directory, "statistics")
+    for name in os.listdir(stats_dir):
+        with open(os.path.join(stats_dir, name), "r", encoding="utf-8") as f:
+            statistics[name[:-len(".json")]] = json.load(f)["response"]
+    return scoreboard, statistics
+
+
+def record_fixtures(directory, date_str):
+    """Saves the real responses for one date so they can be replayed."""
+    import helpers
+
+    params = {"league": helpers.NBA_LEAGUE_ID, "season": helpers.CURRENT_SEASON, "date": date_str}
+    scoreboard, _ = helpers._fetch_from_api("games", params)
+    if scoreboard is None:
+        raise RuntimeError(f"Could not fetch the scoreboard for {date_str}")
+
+    os.makedirs(os.path.join(directory, "statistics"), exist_ok=True)
+    with open(os.path.join(directory, "games.json"), "w", encoding="utf-8") as f:
+        json.dump({"response": scoreboard}, f)
+
+    for game in scoreboard:
+        stats, _ = helpers._fetch_from_api("games/statistics", {"league": helpers.NBA_LEAGUE_ID, "id": game["id"]})
+        with open(os.path.join(directory, "statistics", f"{game['id']}.json"), "w", encoding="utf-8") as f:
+            json.dump({"response": stats or []}, f)
+    print(f"Recorded {len(scoreboard)} games to {directory}")
+
+
+# --- Local API stand-in ---
+
+class FixtureServer:
+    """
+    Serves fixtures on 127.0.0.1 at a random port.
+    latency_ms (+/- jitter) is added to every response; error_rate and
+    rate_limit_rate are the chances of answering 500 or 429 instead.
+    Once the daily quota is used up every request gets a 429. `script`
+    answers come first, in order: an HTTP status, or "rateLimit" for a 200
+    carrying the API's per-minute rate-limit error. With etags=True every
+    200 carries an ETag, and a matching If-None-Match gets a 304.
+    """
+
+    def __init__(self, scoreboard, statistics, scale=1, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, rate_limit_rate=0.0, daily_quota=100000, seed=0,
+                 script=None, retry_after="1", etags=False):
+        self.scoreboard = scoreboard
+        self.statistics = statistics
+        self.scale = scale
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.quota_remaining = daily_quota
+        self.daily_quota = daily_quota
+        self.script = list(script or [])
+        self.retry_after = retry_after
+        self.etags = etags
+        self.counts = {"requests": 0, "errors": 0, "rate_limited": 0, "bytes_sent": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    def scaled_scoreboard(self):
+        games = []
+        for copy in range(self.scale):
+            for game in self.scoreboard:
+                games.append(dict(game, id=game["id"] + copy * ID_STRIDE))
+        return games
+
+    def _decide(self):
+        with self._lock:
+            self.counts["requests"] += 1
+            delay = max(self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms), 0) / 1000
+            if self.quota_remaining == 0:
+                self.counts["rate_limited"] += 1
+                return delay, 429
+            self.quota_remaining -= 1
+            if self.script:
+                return delay, self.script.pop(0)
+            roll = self._rng.random()
+            if roll < self.rate_limit_rate:
+                self.counts["rate_limited"] += 1
+                return delay, 429
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.counts["errors"] += 1
+                return delay, 500
+            return delay, 200
+
+    def _make_handler(self):
+        harness = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                delay, status = harness._decide()
+                time.sleep(delay)
+
+                url = urlparse(self.path)
+                if status == "rateLimit":
+                    status, body = 200, {"errors": {"rateLimit": "Too many requests"}, "response": []}
+                elif status == 200:
+                    if url.path.endswith("/games/statistics"):
+                        game_id = int(parse_qs(url.query).get("id", ["0"])[0]) % ID_STRIDE
+                        body = {"errors": [], "response": harness.statistics.get(str(game_id), [])}
+                    elif url.path.endswith("/games"):
+                        body = {"errors": [], "response": harness.scaled_scoreboard()}
+                    else:
+                        status, body = 404, {"errors": {"endpoint": "unknown"}}
+                else:
+                    body = {"errors": {"replay": f"injected {status}"}}
+
+                payload = json.dumps(body).encode("utf-8")
+                etag = None
+                if harness.etags and status == 200:
+                    etag = f'"{hashlib.sha1(payload).hexdigest()[:16]}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        status, payload = 304, b""
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("x-ratelimit-requests-limit", str(harness.daily_quota))
+                self.send_header("x-ratelimit-requests-remaining", str(harness.quota_remaining))
+                if status == 429 and harness.retry_after is not None:
+                    self.send_header("Retry-After", harness.retry_after)
+                self.end_headers()
+                self.wfile.write(payload)
+                with harness._lock:
+                    harness.counts["bytes_sent"] += len(payload)
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+# --- In-memory Firestore stand-in ---
+
+class _Snapshot:
+    def __init__(self, data):
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return None if self._data is None else dict(self._data)
+
+
+def _deep_merge(target, data):
+    """set(..., merge=True) merges nested maps field by field, like Firestore."""
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+class MemoryDocument:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return MemoryCollection(self._db, f"{self.path}/{name}")
+
+    def get(self):
+        with self._db.lock:
+            self._db.reads += 1
+            return _Snapshot(self._db.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        with self._db.lock:
+            self._db.writes += 1
+            self._db.bytes_written += len(json.dumps(data, default=str))
+            if merge and self.path in self._db.docs:
+                _deep_merge(self._db.docs[self.path], data)
+            else:
+                self._db.docs[self.path] = copy.deepcopy(data)
+
+
+class MemoryCollection:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+
+    def document(self, name):
+        return MemoryDocument(self._db, f"{self.path}/{name}")
+
+    def add(self, data):
+        with self._db.lock:
+            self._db.auto_ids += 1
+            doc_id = f"auto{self._db.auto_ids}"
+        ref = self.document(doc_id)
+        ref.set(data)
+        return None, ref
+
+
+class MemoryBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append((ref, data, merge))
+
+    def commit(self):
+        for ref, data, merge in self._ops:
+            ref.set(data, merge=merge)
+        with self._db.lock:
+            self._db.batches += 1
+        self._ops = []
+
+
+class MemoryFirestore:
+    """Just enough of the Firestore client for get_data / storage."""
+
+    def __init__(self):
+        self.docs = {}
+        self.lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+        self.batches = 0
+        self.bytes_written = 0
+        self.auto_ids = 0
+
+    def collection(self, name):
+        return MemoryCollection(self, name)
+
+    def batch(self):
+        return MemoryBatch(self)
+
+
+# --- Driver ---
+
+def run_replay(scoreboard, statistics, scale, args):
+    import helpers
+    import get_data
+
+    server = FixtureServer(scoreboard, statistics, scale=scale, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                           rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    helpers.BASE_URL = server.start()
+    helpers.reset_api_stats()
+    db = MemoryFirestore()
+
+    start = time.perf_counter()
+    try:
+        get_data.main(incremental=False, db=db)
+    finally:
+        wall = time.perf_counter() - start
+        server.stop()
+
+    api_stats = helpers.get_api_stats()
+    return {
+        "scale": scale,
+        "games": len(scoreboard) * scale,
+        "wall_seconds": wall,
+        "within_budget": wall <= MAX_DURATION_SECONDS,
+        "server": server.counts,
+        "client": api_stats,
+        "firestore": {"reads": db.reads, "writes": db.writes, "batches": db.batches,
+                      "bytes_written": db.bytes_written},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay get_data offline against local stand-ins.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="record real API responses as fixtures")
+    record.add_argument("--fixtures", required=True)
+    record.add_argument("--date", required=True, help="YYYY-MM-DD")
+
+    run = sub.add_parser("run", help="replay fixtures through get_data.main")
+    run.add_argument("--fixtures", help="fixture directory (default: synthetic 12-game slate)")
+    run.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    run.add_argument("--latency-ms", type=float, default=200)
+    run.add_argument("--jitter-ms", type=float, default=100)
+    run.add_argument("--error-rate", type=float, default=0.0)
+    run.add_argument("--rate-limit-rate", type=float, default=0.0)
+    run.add_argument("--workers", type=int, help="override STATS_FETCH_WORKERS")
+    run.add_argument("--rps", type=float, help="override API_REQUESTS_PER_SECOND")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record_fixtures(args.fixtures, args.date)
+        return
+
+    # These are read at import time, so set them before importing the pipeline
+    os.environ.setdefault("RAPIDAPI_KEY", "replay")
+    os.environ["API_CACHE_BYPASS"] = "1"
+    os.environ.pop("FEATURE_STORE_PATH", None)
+    if args.workers:
+        os.environ["STATS_FETCH_WORKERS"] = str(args.workers)
+    if args.rps:
+        os.environ["API_REQUESTS_PER_SECOND"] = str(args.rps)
+        os.environ["API_REQUEST_BURST"] = str(max(int(args.rps), 1))
+
+    if args.fixtures:
+        scoreboard, statistics = load_fixtures(args.fixtures)
+    else:
+        scoreboard, statistics = synthetic_fixtures(seed=args.seed)
+
+    results = []
+    for scale in args.scales:
+        result = run_replay(scoreboard, statistics, scale, args)
+        results.append(result)
+
+    print(f"\n{'scale':>6} {'games':>6} {'wall s':>8} {'budget':>7} {'requests':>9} {'retries':>8} {'writes':>7}")
+    for result in results:
+        print(f"{result['scale']:>6} {result['games']:>6} {result['wall_seconds']:>8.2f} "
+              f"{'ok' if result['within_budget'] else 'OVER':>7} {result['client']['requests']:>9} "
+              f"{result['client']['retries']:>8} {result['firestore']['writes']:>7}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
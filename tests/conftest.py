@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The api modules import each other as top-level modules (like Vercel runs them)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'api')))
@@ -0,0 +1,97 @@
+"""
+API client: retries, Retry-After, the 200 + rateLimit answer and the daily
+quota lockout, run against the replay FixtureServer.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import helpers
+from replay import FixtureServer, synthetic_fixtures
+
+DATE = "2026-01-15"
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Points helpers at a FixtureServer; call api(script=..., daily_quota=...) to start one."""
+    servers = []
+
+    def start(**kwargs):
+        scoreboard, statistics = synthetic_fixtures(games=2, players_per_team=2)
+        server = FixtureServer(scoreboard, statistics, **kwargs)
+        monkeypatch.setattr(helpers, "BASE_URL", server.start())
+        servers.append(server)
+        return server
+
+    monkeypatch.setattr(helpers, "API_KEY", "test-key")
+    monkeypatch.setattr(helpers, "_throttle", helpers._RequestThrottle(1000, 1000))
+    # No jitter: a backoff is exactly its floor (0, or Retry-After)
+    monkeypatch.setattr(helpers.random, "uniform", lambda low, high: low)
+    helpers.reset_api_stats()
+    yield start
+    for server in servers:
+        server.stop()
+    helpers.reset_api_stats()
+
+
+def fetch():
+    return helpers.get_games_for_date(DATE, use_cache=False)
+
+
+@pytest.mark.parametrize("failure", [500, 503, 429, "rateLimit"])
+def test_transient_failures_are_retried(api, failure):
+    server = api(script=[failure, failure], retry_after=None)
+    assert len(fetch()) == 2
+    assert server.counts["requests"] == 3
+    assert helpers.get_api_stats()["retries"] == 2
+
+
+def test_retry_after_sets_the_backoff(api):
+    server = api(script=[429], retry_after="1")
+    started = time.monotonic()
+    assert len(fetch()) == 2
+    assert server.counts["requests"] == 2
+    assert helpers.get_api_stats()["backoff_wait_seconds"] == 1.0
+    assert time.monotonic() - started >= 1.0
+
+
+def test_gives_up_after_max_retries(api):
+    server = api(script=[500] * (helpers.MAX_RETRIES + 1))
+    assert fetch() is None
+    assert server.counts["requests"] == helpers.MAX_RETRIES + 1
+
+
+def test_no_retries_or_requests_once_the_quota_is_gone(api):
+    server = api(daily_quota=0)
+    # A 429 that says 0 requests left isn't retried...
+    assert fetch() is None
+    assert server.counts["requests"] == 1
+    assert helpers.get_api_stats()["retries"] == 0
+    # ...and nothing more is sent while we're locked out
+    assert fetch() is None
+    assert server.counts["requests"] == 1
+
+
+def test_probe_after_the_quota_resets(api, monkeypatch):
+    server = api(daily_quota=0)
+    assert fetch() is None
+
+    # The probe interval passes, but the quota hasn't reset: one probe only
+    helpers._throttle.quota_seen_at -= helpers.QUOTA_PROBE_SECONDS
+    assert fetch() is None
+    assert fetch() is None
+    assert server.counts["requests"] == 2
+
+    # A new UTC day: the quota is back and the probe gets through
+    server.quota_remaining = 50
+    helpers._throttle.quota_seen_at -= 86400
+    assert len(fetch()) == 2
+    assert len(fetch()) == 2
+    assert server.counts["requests"] == 4
+    assert helpers.get_api_stats()["quota_remaining"] == 48
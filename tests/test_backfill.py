@@ -0,0 +1,80 @@
+"""
+Backfill: a past date is only archived (and checkpointed) once every game
+on it is over, and a past scoreboard is only cached for good by then.
+"""
+
+import pytest
+
+import backfill
+import helpers
+import records
+import response_cache
+
+DATE = "2026-01-15"
+
+
+def raw_game(game_id, status):
+    return {"id": game_id, "status": {"short": status},
+            "teams": {"home": {"code": "BOS", "name": "Boston Celtics"},
+                      "visitors": {"code": "MIA", "name": "Miami Heat"}},
+            "scores": {"home": {"total": 100}, "visitors": {"total": 90}}}
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """Scoreboard answers come from `statuses`; every request is counted."""
+    statuses = {"status": "Q4"}
+    calls = []
+
+    def fetch(endpoint, params, cached=None):
+        calls.append(endpoint)
+        return [raw_game(100, statuses["status"])], {}
+
+    monkeypatch.setattr(helpers, "_cache", response_cache.ResponseCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(helpers, "API_KEY", "test-key")
+    monkeypatch.setattr(helpers, "CACHE_BYPASS", False)
+    monkeypatch.setattr(helpers, "_fetch_from_api", fetch)
+    return statuses, calls
+
+
+def test_past_scoreboard_is_pinned_only_once_every_game_is_over(api, monkeypatch):
+    statuses, calls = api
+    monkeypatch.setattr(helpers, "LIVE_STATS_TTL_SECONDS", 0)
+
+    assert helpers.get_games_for_date(DATE)[0]["status"] == "Q4"
+    assert helpers._cache.get("games", {"league": helpers.NBA_LEAGUE_ID, "season": helpers.CURRENT_SEASON,
+                                        "date": DATE}).expires_at is not None
+
+    statuses["status"] = "FT"
+    assert helpers.get_games_for_date(DATE)[0]["status"] == "FT"
+    assert helpers.get_games_for_date(DATE)[0]["status"] == "FT"
+    assert calls == ["games", "games"]
+
+
+def test_scoreboard_pinned_too_early_is_checked_again(api):
+    statuses, calls = api
+    params = {"league": helpers.NBA_LEAGUE_ID, "season": helpers.CURRENT_SEASON, "date": DATE}
+    # Kept forever by an older version while the game was live
+    helpers._cache.set("games", params, [raw_game(100, "Q4")], response_cache.NEVER_EXPIRES)
+
+    statuses["status"] = "FT"
+    assert helpers.get_games_for_date(DATE)[0]["status"] == "FT"
+    assert calls == ["games"]
+
+
+def test_date_with_unfinished_games_is_not_checkpointed(monkeypatch, tmp_path):
+    pytest.importorskip("pyarrow")
+    scoreboard = [{"game_id": 100, "game_date": DATE, "status": "Q4"},
+                  {"game_id": 101, "game_date": DATE, "status": "POST"}]
+    line = records.PlayerStatLine(1, "Player 1", "Boston Celtics", 30.0, pts=20)
+    monkeypatch.setattr(helpers, "get_games_for_date", lambda date_str, season=None, use_cache=True: scoreboard)
+    monkeypatch.setattr(helpers, "get_player_stat_lines", lambda game_id, finished=False: [line])
+    archive = str(tmp_path / "archive")
+
+    assert backfill.backfill_date(DATE, archive) is None
+    assert backfill.backfill(DATE, DATE, archive)["done"] == []
+
+    # Once it's final the date is archived; the postponed game never will be
+    scoreboard[0]["status"] = "FT"
+    assert backfill.backfill(DATE, DATE, archive)["done"] == [DATE]
+    assert len(backfill.load_history(archive=archive)) == 1
@@ -0,0 +1,81 @@
+"""
+Feature store: per-season state, idempotent updates, and agreement with a
+full recompute (model.build_feature_table).
+"""
+
+import numpy as np
+import pandas as pd
+
+import feature_store
+import model
+import snapshots
+
+
+def make_logs(dates_by_player, seed=0):
+    """Model-style logs, each player's games most recent first."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for player_id, dates in dates_by_player.items():
+        for i, game_date in enumerate(sorted(dates, reverse=True)):
+            rows.append({"PLAYER_ID": player_id, "GAME_ID": player_id * 1000 + i, "GAME_DATE": game_date,
+                         "MIN": float(rng.integers(10, 40)), "PTS": float(rng.integers(0, 35)),
+                         "AST": float(rng.integers(0, 10)), "REB": float(rng.integers(0, 12)),
+                         "FG3M": 2.0, "FGA": float(rng.integers(5, 20)), "FTA": 3.0, "TOV": 2.0, "FG3_PCT": 0.4})
+    return pd.DataFrame(rows)
+
+
+def values(pts):
+    return dict({col: 1.0 for col in feature_store.STORE_COLS}, PTS=float(pts))
+
+
+def test_new_season_starts_over_and_old_season_is_ignored():
+    store = feature_store.FeatureStore()
+    assert store.add_game(1, 10, "2025-03-01", values(30))
+    assert store.add_game(1, 20, "2025-10-25", values(10))
+
+    state = store.players["1"]
+    assert state["season"] == "2025-2026" and state["games"] == 1
+    assert store.features(1)["PTS"] == 10.0
+    # A late game from last season doesn't leak into this one
+    assert not store.add_game(1, 11, "2025-03-02", values(50))
+    assert store.features(1)["PTS"] == 10.0
+
+
+def test_same_game_twice_is_a_no_op():
+    store = feature_store.FeatureStore()
+    assert store.add_game(1, 10, "2026-01-01", values(20))
+    assert not store.add_game(1, 10, "2026-01-01", values(20))
+    assert store.players["1"]["games"] == 1
+    assert store.features(1)["PTS_L5"] == 20.0
+
+
+def test_rebuild_matches_full_recompute_across_seasons():
+    last_season = [f"2025-03-{day:02d}" for day in range(1, 16)]
+    this_season = [f"2025-11-{day:02d}" for day in range(1, 13)]
+    logs = make_logs({1: last_season + this_season, 2: this_season[:3]})
+
+    store = feature_store.FeatureStore.rebuild_from_logs(logs)
+    assert store.players["1"]["games"] == 12
+    # Only this season's games count, so last season's rows aren't mismatches
+    assert store.verify(logs) == {}
+
+    store.players["2"]["sums"]["PTS"] += 3
+    assert list(store.verify(logs)) == [2]
+
+
+def test_snapshot_features_come_from_the_store_when_in_sync():
+    logs = make_logs({1: [f"2026-01-{day:02d}" for day in range(1, 11)],
+                      2: [f"2026-01-{day:02d}" for day in range(1, 6)]})
+    expected = model.build_feature_table(logs)
+
+    # Player 2's state is missing a game, so it's recomputed and reseeded
+    missing = (logs["PLAYER_ID"] == 2) & (logs["GAME_DATE"] == "2026-01-05")
+    store = feature_store.FeatureStore.rebuild_from_logs(logs[~missing])
+    assert store.players["2"]["games"] == 4
+    table = snapshots.slate_feature_table(logs, store)
+    pd.testing.assert_frame_equal(table.loc[expected.index], expected, check_exact=False, rtol=1e-9)
+    assert store.players["2"]["games"] == 5
+
+    # Read from the store, not recomputed: a change there shows up
+    store.players["1"]["sums"]["PTS"] += 10
+    assert snapshots.slate_feature_table(logs, store).loc[1, "PTS"] == expected.loc[1, "PTS"] + 1
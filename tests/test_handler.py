@@ -0,0 +1,56 @@
+"""
+Vercel entry point: only the cron (Bearer $CRON_SECRET) may start a run,
+and the response doesn't carry the run summary.
+"""
+
+import io
+import json
+
+import pytest
+
+import get_data
+
+
+def call(authorization=None, path="/api/get_data"):
+    request = get_data.handler.__new__(get_data.handler)
+    request.path = path
+    request.headers = {"Authorization": authorization} if authorization else {}
+    request.wfile = io.BytesIO()
+    request.request_version = "HTTP/1.1"
+    request.requestline = f"GET {path} HTTP/1.1"
+    request.command = "GET"
+    request.client_address = ("127.0.0.1", 0)
+    request.log_message = lambda *args: None
+    request.do_GET()
+    head, _, body = request.wfile.getvalue().partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    calls = []
+
+    def main(incremental=None, db=None):
+        calls.append(incremental)
+        return {"run_id": "abc123", "api": {"quota_remaining": 99}, "stages": {}}
+
+    monkeypatch.setattr(get_data, "main", main)
+    monkeypatch.setenv("CRON_SECRET", "s3cret")
+    return calls
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "s3cret", "Bearer s3cret "])
+def test_requests_without_the_cron_secret_are_refused(runs, authorization):
+    assert call(authorization) == (401, {"ok": False, "error": "Unauthorized"})
+    assert runs == []
+
+
+def test_nothing_runs_when_no_secret_is_configured(runs, monkeypatch):
+    monkeypatch.delenv("CRON_SECRET")
+    assert call("Bearer ")[0] == 401
+    assert runs == []
+
+
+def test_cron_request_runs_without_leaking_the_summary(runs):
+    assert call("Bearer s3cret", "/api/get_data?mode=incremental") == (200, {"ok": True, "run_id": "abc123"})
+    assert runs == [True]
@@ -0,0 +1,83 @@
+"""
+Incremental refresh: a live or finished game whose stats fetch failed (or
+came back empty) must be fetched again on the next run, not stored as done.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import get_data
+import helpers
+import storage
+from replay import MemoryFirestore
+
+DATE = "2026-01-15"
+STAT_LINE = {"player_id": 1, "player_name": "Player 1", "team_name": "Boston Celtics", "min": 30.0,
+             "pts": 20, "reb": 5, "ast": 4}
+
+
+def scoreboard():
+    return [{"game_id": 100, "game_date": DATE, "home": "BOS", "away": "LAL", "status": "FT",
+             "home_score": 110, "away_score": 101, "player_stats": []}]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Fake helpers: today's scoreboard plus a scripted stats response per call."""
+    calls = []
+    responses = []
+
+    def get_player_stats_for_game(game_id, finished=False):
+        calls.append(game_id)
+        return responses.pop(0)
+
+    monkeypatch.setattr(helpers, "get_upcoming_games", lambda days=1, use_cache=True: scoreboard())
+    monkeypatch.setattr(helpers, "get_player_stats_for_game", get_player_stats_for_game)
+    monkeypatch.delenv("FEATURE_STORE_PATH", raising=False)
+    return calls, responses
+
+
+@pytest.mark.parametrize("first_response", [None, []], ids=["fetch_failed", "no_stats_yet"])
+def test_failed_stats_are_refetched_next_run(api, first_response):
+    calls, responses = api
+    db = MemoryFirestore()
+
+    responses.append(first_response)
+    get_data.run_incremental(db, DATE)
+    assert calls == [100]
+    # The new FT state wasn't stored, so it still looks changed next run
+    assert "100" not in storage.load_index(db, DATE)
+
+    responses.append([dict(STAT_LINE)])
+    get_data.run_incremental(db, DATE)
+    assert calls == [100, 100]
+    stored = storage.load_index(db, DATE)["100"]
+    assert stored["status"] == "FT" and stored["player_count"] == 1
+
+    # Now it's really done: no more requests
+    get_data.run_incremental(db, DATE)
+    assert calls == [100, 100]
+
+
+def test_stored_game_without_stats_is_refetched():
+    # e.g. written by a full run whose stats request failed
+    game = scoreboard()[0]
+    stored = {"100": dict(game, player_count=0, stats_error="player stats request failed")}
+    to_fetch, to_write = get_data.select_changed_games([game], stored)
+    assert [g["game_id"] for g in to_fetch] == [100]
+    assert [g["game_id"] for g in to_write] == [100]
+
+    stored = {"100": dict(game, player_count=12)}
+    assert get_data.select_changed_games([game], stored) == ([], [])
+
+
+def test_failed_fetch_is_recorded(api):
+    calls, responses = api
+    responses.append(None)
+    games = scoreboard()
+    assert get_data.fetch_player_stats_concurrently(games) == [100]
+    assert games[0]["stats_error"]
@@ -0,0 +1,44 @@
+"""
+Run metrics: per-stage memory is the growth during the stage, and API
+bytes are what came over the wire.
+"""
+
+import io
+
+import pytest
+
+import helpers
+import instrumentation
+
+
+@pytest.mark.skipif(instrumentation.current_rss_mb() is None, reason="needs /proc")
+def test_rss_growth_is_per_stage():
+    metrics = instrumentation.RunMetrics()
+    with metrics.stage("allocate"):
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b"x" * len(block[::4096])
+    with metrics.stage("idle"):
+        pass
+    del block
+
+    summary = metrics.summary()
+    assert summary["stages"]["allocate"]["rss_growth_mb"] > 48
+    assert abs(summary["stages"]["idle"]["rss_growth_mb"]) < 8
+    assert "peak_rss_mb" not in summary["stages"]["allocate"]
+    assert summary["process_peak_rss_mb"] is not None
+
+
+class FakeResponse:
+    def __init__(self, headers, content, raw_bytes):
+        self.headers = headers
+        self.content = content
+        self.raw = io.BytesIO(b"x" * raw_bytes)
+        self.raw.seek(raw_bytes)
+
+
+def test_transferred_bytes_are_not_the_decoded_body():
+    body = b"{}" * 500
+    # gzip: 1000 decoded bytes arrived as 120
+    assert helpers._transferred_bytes(FakeResponse({"Content-Length": "120"}, body, 120)) == 120
+    # Chunked (no Content-Length): what was read off the socket
+    assert helpers._transferred_bytes(FakeResponse({}, body, 150)) == 150
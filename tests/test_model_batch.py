@@ -0,0 +1,148 @@
+"""
+The batch paths in model.py must give exactly the per-player results:
+build_feature_table vs calculate_season_averages/calculate_recent_form,
+PropBoardScorer.score vs calculate_hit_rates and PlayerPropModel.predict.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import model
+
+STATS = ['pts', 'ast', 'reb', 'PRA']
+
+
+def make_logs(players=25, max_games=30, seed=0):
+    """Long-format logs, most recent first, with uneven game counts."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for player_id in range(1, players + 1):
+        n = int(rng.integers(1, max_games))
+        mins = rng.uniform(5, 40, n).round(1)
+        mins[rng.random(n) < 0.1] = 0  # DNPs: USG must come out as 0, not inf
+        fga = rng.poisson(mins * 0.4)
+        frames.append(pd.DataFrame({
+            'PLAYER_ID': player_id,
+            'MIN': mins,
+            'PTS': rng.poisson(mins * 0.6),
+            'AST': rng.poisson(mins * 0.15),
+            'REB': rng.poisson(mins * 0.2),
+            'FG3M': rng.poisson(mins * 0.05),
+            'FGA': fga,
+            'FTA': rng.poisson(mins * 0.1),
+            'TOV': rng.poisson(mins * 0.05),
+            'FG3_PCT': rng.uniform(0, 0.6, n).round(3),
+        }))
+    # Interleave players like a real multi-player pull, keeping each
+    # player's own rows in their most-recent-first order
+    logs = pd.concat(frames, ignore_index=True)
+    slots = logs['PLAYER_ID'].to_numpy()[rng.permutation(len(logs))]
+    rows = np.empty(len(logs), dtype=np.int64)
+    rows[np.argsort(slots, kind='stable')] = np.arange(len(logs))
+    return logs.iloc[rows].reset_index(drop=True)
+
+
+def string_logs(logs):
+    """Same logs with PTS as object-dtype strings, including junk and missing values."""
+    logs = logs.copy()
+    pts = logs['PTS'].astype(str).astype(object)
+    pts.iloc[::7] = 'DNP'
+    pts.iloc[3::11] = None
+    logs['PTS'] = pts
+    return logs
+
+
+def per_player_frames(logs):
+    return {player_id: frame for player_id, frame in logs.groupby('PLAYER_ID', sort=False)}
+
+
+@pytest.fixture(params=['numeric', 'string'])
+def logs(request):
+    logs = make_logs()
+    return logs if request.param == 'numeric' else string_logs(logs)
+
+
+def test_feature_table_matches_per_player_functions(logs):
+    table = model.build_feature_table(logs)
+
+    for player_id, frame in per_player_frames(logs).items():
+        expected = model.calculate_season_averages(frame)
+        expected.update(model.calculate_recent_form(frame, last_n=10))
+        expected.update(model.calculate_recent_form(frame, last_n=5))
+
+        row = model.get_player_features(table, player_id)
+        assert row.keys() == expected.keys()
+        for key, value in expected.items():
+            # bit-for-bit, not approximately
+            assert row[key] == value, (player_id, key)
+
+
+def test_feature_table_handles_zero_minutes():
+    logs = make_logs(players=3)
+    logs['MIN'] = 0
+    table = model.build_feature_table(logs)
+    assert np.isfinite(table.to_numpy()).all()
+    assert (table['USG_PCT'] == 0).all()
+
+
+def test_unknown_player_gets_empty_features():
+    table = model.build_feature_table(make_logs(players=2))
+    features = model.get_player_features(table, 999)
+    assert features['PTS'] == 0 and features['PTS_L5'] == 0
+
+
+def test_board_scorer_matches_hit_rates_and_predict(logs):
+    frames = per_player_frames(logs)
+    rng = np.random.default_rng(1)
+    players, stats, lines = [], [], []
+    for player_id in frames:
+        for stat in STATS:
+            players.append(player_id)
+            stats.append(stat)
+            lines.append(float(rng.integers(0, 30)) + 0.5)
+    # A player we have no logs for scores as zeros
+    players.append(999)
+    stats.append('pts')
+    lines.append(10.5)
+
+    board = model.PropBoardScorer(logs).score(players, stats, lines)
+    prop_model = model.PlayerPropModel()
+
+    for row in board.itertuples(index=False):
+        frame = frames.get(row.player)
+        features = model.build_enhanced_feature_vector(frame, 'BOS', 'LAL', 'G', None)
+        assert row.PROJECTION == prop_model.predict(features, row.stat), (row.player, row.stat)
+
+        if row.stat == 'PRA':
+            continue  # calculate_hit_rates doesn't support PRA
+        expected = model.calculate_hit_rates(frame, row.stat, row.line)
+        assert (row.L5, row.L10, row.Season) == (expected['L5'], expected['L10'], expected['Season']), \
+            (row.player, row.stat)
+
+
+def test_board_scorer_pra_hit_rates_use_game_totals():
+    logs = make_logs(players=3)
+    frame = logs[logs['PLAYER_ID'] == 1]
+    totals = (frame['PTS'] + frame['REB'] + frame['AST']).reset_index(drop=True)
+    line = float(totals.median()) + 0.5
+
+    row = model.PropBoardScorer(logs).score([1], ['PRA'], [line]).iloc[0]
+    assert row.Season == int((totals > line).sum() / len(totals) * 100)
+    assert row.L5 == int((totals.head(5) > line).sum() / len(totals.head(5)) * 100)
+
+
+def test_simulator_probabilities_do_not_depend_on_board_order():
+    logs = make_logs(players=10)
+    players = np.repeat(np.arange(1, 11), len(STATS))
+    stats = np.tile(STATS, 10)
+    lines = np.full(len(players), 8.5)
+    simulator = model.PropSimulator(logs)
+
+    board = simulator.simulate(players, stats, lines, draws=2000, seed=7)
+    reversed_board = simulator.simulate(players[::-1], stats[::-1], lines[::-1], draws=2000, seed=7)
+    pd.testing.assert_frame_equal(board, reversed_board.iloc[::-1].reset_index(drop=True))
+
+    # Dropping everyone else doesn't change one player's numbers either
+    alone = simulator.simulate(players[:4], stats[:4], lines[:4], draws=2000, seed=7)
+    pd.testing.assert_frame_equal(alone, board.iloc[:4])
@@ -0,0 +1,29 @@
+"""
+Stat line parsing: counts fit the uint8 columns and parse however the API
+sends them.
+"""
+
+import pytest
+
+import records
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (5, 5), ("5", 5), (5.0, 5), ("5.0", 5), ("7.9", 7),
+    (None, 0), ("", 0), ("abc", 0), (-3, 0), (float("nan"), 0), (float("inf"), 0),
+    (300, records.MAX_COUNT), ("1e9", records.MAX_COUNT),
+])
+def test_parse_count(raw, expected):
+    assert records.parse_count(raw) == expected
+
+
+def test_out_of_range_counts_dont_abort_the_batch():
+    parsed = records.PlayerStatLine.from_api(
+        {"player": {"id": 1, "firstname": "A", "lastname": "B"}, "min": "34:12", "points": 300, "assists": "5.0"},
+        "Boston Celtics")
+    built = records.PlayerStatLine(2, "C D", "Boston Celtics", 30.0, pts=300, reb=-1)
+
+    packed = records.to_structured_array([parsed, built], game_id=9)
+    assert packed["pts"].tolist() == [records.MAX_COUNT, records.MAX_COUNT]
+    assert packed["ast"].tolist() == [5, 0]
+    assert packed["reb"].tolist() == [0, 0]
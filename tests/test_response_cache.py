@@ -0,0 +1,113 @@
+"""
+Response cache: TTL expiry, LRU eviction, ETag revalidation, and empty
+answers never being kept forever.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import helpers
+import response_cache
+from response_cache import NEVER_EXPIRES, ResponseCache
+from replay import FixtureServer, synthetic_fixtures
+
+GAME_ID = 400000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable clock for the cache's expiry checks."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("API_CACHE_DIR", str(tmp_path))
+    return ResponseCache(os.environ["API_CACHE_DIR"])
+
+
+@pytest.fixture
+def api(monkeypatch, cache):
+    """helpers against a FixtureServer that sends ETags, caching to the temp dir."""
+    scoreboard, statistics = synthetic_fixtures(games=1, players_per_team=2)
+    server = FixtureServer(scoreboard, statistics, etags=True)
+    monkeypatch.setattr(helpers, "BASE_URL", server.start())
+    monkeypatch.setattr(helpers, "API_KEY", "test-key")
+    monkeypatch.setattr(helpers, "CACHE_BYPASS", False)
+    monkeypatch.setattr(helpers, "_cache", cache)
+    monkeypatch.setattr(helpers, "_throttle", helpers._RequestThrottle(1000, 1000))
+    helpers.reset_api_stats()
+    yield server
+    server.stop()
+    helpers.reset_api_stats()
+
+
+def test_entries_expire_after_their_ttl(cache, clock):
+    cache.set("games", {"date": "a"}, [1], 60)
+    cache.set("games", {"date": "b"}, [2], NEVER_EXPIRES)
+    assert cache.get("games", {"date": "a"}).fresh
+
+    clock[0] += 61
+    stale = cache.get("games", {"date": "a"})
+    # Stale entries still come back, for a conditional refresh
+    assert not stale.fresh and stale.payload == [1]
+    assert cache.get("games", {"date": "b"}).fresh
+    assert cache.get("games", {"date": "c"}) is None
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for name in "abc":
+        cache.set("games", {"date": name}, ["x" * 100], NEVER_EXPIRES)
+    # Spread the mtimes out, then read "a" so "b" is the oldest
+    for age, name in zip((30, 20, 10), "abc"):
+        path = cache._path(cache.make_key("games", {"date": name}))
+        os.utime(path, (os.path.getmtime(path) - age,) * 2)
+    cache.get("games", {"date": "a"})
+
+    # Room for three entries (sizes differ by a byte or two with stored_at)
+    entry_size = os.path.getsize(cache._path(cache.make_key("games", {"date": "a"})))
+    cache.max_bytes = 3 * entry_size + entry_size // 2
+    cache.set("games", {"date": "d"}, ["x" * 100], NEVER_EXPIRES)
+
+    assert cache.get("games", {"date": "b"}) is None
+    assert all(cache.get("games", {"date": name}) for name in "acd")
+
+
+def test_stale_entry_is_revalidated_with_its_etag(api, clock):
+    lines = helpers.get_player_stat_lines(GAME_ID)
+    entry = helpers._cache.get("games/statistics", {"league": helpers.NBA_LEAGUE_ID, "id": GAME_ID})
+    assert entry.etag and api.counts["requests"] == 1
+
+    # Still fresh: no request
+    assert len(helpers.get_player_stat_lines(GAME_ID)) == len(lines)
+    assert api.counts["requests"] == 1
+
+    # Stale: a conditional request, the 304 reuses and re-freshens the entry
+    clock[0] += helpers.LIVE_STATS_TTL_SECONDS + 1
+    assert len(helpers.get_player_stat_lines(GAME_ID)) == len(lines)
+    assert api.counts["requests"] == 2
+    assert helpers.get_api_stats()["cache_revalidations"] == 1
+    assert helpers._cache.get("games/statistics", {"league": helpers.NBA_LEAGUE_ID, "id": GAME_ID}).fresh
+
+
+def test_empty_answer_is_never_pinned(api, clock):
+    params = {"league": helpers.NBA_LEAGUE_ID, "id": 123}
+    # A finished game whose box score isn't published yet
+    assert helpers.get_player_stat_lines(123, finished=True) == []
+    assert helpers._cache.get("games/statistics", params).expires_at is not None
+
+    clock[0] += helpers.LIVE_STATS_TTL_SECONDS + 1
+    helpers.get_player_stat_lines(123, finished=True)
+    assert api.counts["requests"] == 2
+
+    # A finished box score is kept for good
+    assert helpers.get_player_stat_lines(GAME_ID, finished=True)
+    entry = helpers._cache.get("games/statistics", {"league": helpers.NBA_LEAGUE_ID, "id": GAME_ID})
+    assert entry.expires_at is None
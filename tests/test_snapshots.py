@@ -0,0 +1,94 @@
+"""
+Prop snapshots: built from the player logs get_data keeps in Firestore,
+with only book lines ranked by edge.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import get_data
+import snapshots
+import storage
+from replay import MemoryFirestore
+
+TEAMS = {"BOS": "Boston Celtics", "MIA": "Miami Heat", "DEN": "Denver Nuggets", "PHX": "Phoenix Suns"}
+ROSTER = ((1, "BOS"), (2, "BOS"), (3, "MIA"))
+
+
+def make_game(game_id, date, status="FT", pts=20, home="BOS", away="MIA", roster=ROSTER):
+    game = {"game_id": game_id, "game_date": date, "status": status, "home": home, "away": away,
+            "home_team_name": TEAMS[home], "away_team_name": TEAMS[away], "player_stats": []}
+    if status == "FT":
+        game["player_stats"] = [
+            {"player_id": player_id, "player_name": f"Player {player_id}", "team_name": TEAMS[team],
+             "min": 30.0, "pts": pts + player_id, "reb": 5, "ast": 4, "turnovers": 2,
+             "fga": 12, "fta": 4, "tpm": 2, "tpa": 5}
+            for player_id, team in roster
+        ]
+    return game
+
+
+def seeded_db(days=6):
+    db = MemoryFirestore()
+    for day in range(1, days + 1):
+        get_data.update_player_logs(db, f"2026-01-{day:02d}", [make_game(100 + day, f"2026-01-{day:02d}")])
+    return db
+
+
+def test_player_logs_accumulate_and_feed_the_slate():
+    db = seeded_db()
+    # A game that hasn't finished never joins the logs
+    get_data.update_player_logs(db, "2026-01-07", [make_game(107, "2026-01-07", status="Q2")])
+
+    logs = storage.load_player_logs(db, "2025-2026", list(TEAMS.values()))
+    assert sorted(logs[TEAMS["BOS"]]) == ["1", "2"]
+    assert len(logs[TEAMS["BOS"]]["1"]["games"]) == 6
+
+    slate = [make_game(200, "2026-01-10", status="NS")]
+    result = get_data.publish_prop_snapshots(db, "2026-01-10", slate)
+    assert sorted(result["written"]) == sorted(snapshots.SNAPSHOT_STATS)
+    rows = storage.snapshot_ref(db, "2026-01-10", "pts").get().to_dict()["rows"]
+    assert sorted(row["player_id"] for row in rows) == [1, 2, 3]
+
+
+def test_only_book_lines_are_ranked_by_edge():
+    db = seeded_db()
+    slate = [make_game(200, "2026-01-10", status="NS")]
+    logs = snapshots.load_slate_logs(db, slate, "2026-01-10")
+    # Player 1 averages 21 points, player 3 averages 23
+    rows = snapshots.build_snapshots(logs, slate, {"1": {"pts": 15.5}, "3": {"pts": 22.5}})["pts"]
+
+    assert [row["player_id"] for row in rows] == [1, 3, 2]
+    assert rows[0]["line"] == 15.5 and rows[0]["side"] == "over"
+    unlined = rows[2]
+    assert unlined["line"] is None and unlined["edge"] is None and unlined["side"] is None
+    assert unlined["hit_rate_line"] == 22.5
+
+
+def test_traded_players_follow_their_latest_team():
+    db = MemoryFirestore()
+    for day in range(1, 6):
+        date = f"2026-01-{day:02d}"
+        # Player 1 starts the season in Boston, player 4 in Denver
+        get_data.update_player_logs(db, date, [
+            make_game(100 + day, date, roster=((1, "BOS"), (2, "BOS"), (3, "MIA"))),
+            make_game(200 + day, date, home="DEN", away="PHX", roster=((4, "DEN"), (5, "PHX"))),
+        ])
+    # Then they swap teams
+    get_data.update_player_logs(db, "2026-01-06", [
+        make_game(106, "2026-01-06", roster=((4, "BOS"), (2, "BOS"), (3, "MIA"))),
+        make_game(206, "2026-01-06", home="DEN", away="PHX", roster=((1, "DEN"), (5, "PHX"))),
+    ])
+
+    slate = [make_game(300, "2026-01-10", status="NS")]
+    logs = snapshots.load_slate_logs(db, slate, "2026-01-10")
+    games_played = logs.groupby("PLAYER_ID").size().to_dict()
+    # Traded away: not a Celtic any more
+    assert 1 not in games_played
+    # Traded in: all six games, not only the one for Boston
+    assert games_played == {2: 6, 3: 6, 4: 6}
+
+    rows = snapshots.build_snapshots(logs, slate)["pts"]
+    assert {row["player_id"]: row["team"] for row in rows} == {2: "BOS", 3: "MIA", 4: "BOS"}